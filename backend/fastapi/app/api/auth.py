@@ -4,13 +4,14 @@ User authentication, registration, and session management
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
+from fastapi.responses import ORJSONResponse
+from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.security.http import HTTPBearer
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
 import jwt
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
 
 from app.core.database import get_db
@@ -27,25 +28,22 @@ from app.schemas.user import UserCreate, UserResponse, UserLogin, Token
 from app.services.user_service import UserService
 from app.core.logging import log_security_event, log_api_request
 
-router = APIRouter(prefix="/auth", tags=["authentication"])
+router = APIRouter(prefix="/auth", tags=["authentication"], default_response_class=ORJSONResponse)
 
-# OAuth2 scheme
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# Password context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def get_user_service(db: Session = Depends(get_db)) -> UserService:
+    """Get user service instance"""
+    return UserService(db)
 
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Register a new user"""
     try:
         # Check if user already exists
-        user_service = UserService(db)
-        
         if await user_service.get_user_by_email(user_data.email):
             log_security_event(
                 "registration_failed",
@@ -70,8 +68,11 @@ async def register(
                 detail="Username already registered"
             )
         
+        # Hash the password only once the registration is accepted
+        # (bcrypt is CPU-bound, keep it off the event loop)
+        hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
+        
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
         user = await user_service.create_user(
             username=user_data.username,
             email=user_data.email,
@@ -113,16 +114,14 @@ async def register(
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Authenticate user and return access token"""
     try:
-        user_service = UserService(db)
-        
         # Get user by username
         user = await user_service.get_user_by_username(form_data.username)
         
-        if not user or not verify_password(form_data.password, user.hashed_password):
+        if not user or not await asyncio.to_thread(verify_password, form_data.password, user.hashed_password):
             log_security_event(
                 "login_failed",
                 user_id=user.id if user else None,
@@ -295,12 +294,12 @@ async def change_password(
     current_password: str,
     new_password: str,
     current_user: User = Depends(get_current_user_from_token),
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Change user password"""
     try:
         # Verify current password
-        if not verify_password(current_password, current_user.hashed_password):
+        if not await asyncio.to_thread(verify_password, current_password, current_user.hashed_password):
             log_security_event(
                 "password_change_failed",
                 user_id=current_user.id,
@@ -313,8 +312,7 @@ async def change_password(
             )
         
         # Update password
-        user_service = UserService(db)
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await asyncio.to_thread(get_password_hash, new_password)
         await user_service.update_password(current_user.id, hashed_password)
         
         log_security_event(
@@ -344,11 +342,10 @@ async def change_password(
 @router.post("/forgot-password")
 async def forgot_password(
     email: EmailStr,
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Initiate password reset process"""
     try:
-        user_service = UserService(db)
         user = await user_service.get_user_by_email(email)
         
         if not user:
@@ -389,7 +386,7 @@ async def forgot_password(
 async def reset_password(
     token: str,
     new_password: str,
-    db: Session = Depends(get_db)
+    user_service: UserService = Depends(get_user_service)
 ):
     """Reset password with token"""
     try:
@@ -410,8 +407,7 @@ async def reset_password(
             )
         
         # Update password
-        user_service = UserService(db)
-        hashed_password = get_password_hash(new_password)
+        hashed_password = await asyncio.to_thread(get_password_hash, new_password)
         await user_service.update_password(user_id, hashed_password)
         
         log_security_event(
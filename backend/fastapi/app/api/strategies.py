@@ -3,16 +3,19 @@ VELOX-N8N Strategy API
 REST API endpoints for strategy management and execution
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, Header
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Iterator, Callable, Awaitable
 from datetime import datetime
+import hashlib
+import orjson
 
 from app.core.database import get_db
 from app.core.security import get_current_user_from_token
 from app.models.user import User
 from app.models.strategy import Strategy, StrategyPerformance
-from app.services.strategy_service import StrategyService
+from app.services.strategy_service import StrategyService, BacktestPeriodTooShort
 from app.schemas.strategy import (
     StrategyCreate, StrategyUpdate, StrategyResponse, StrategyListRequest,
     StrategyPerformanceRequest, StrategyBacktestRequest, StrategyBacktestResponse,
@@ -20,9 +23,117 @@ from app.schemas.strategy import (
     StrategyOptimizationResult, StrategyComparisonRequest, StrategyComparisonResult,
     StrategyAlert, StrategyStats, StrategyType, StrategyStatus, ExecutionMode
 )
+from app.core.errors import handle_errors
 from app.core.logging import log_api_request, log_security_event
-
-router = APIRouter(prefix="/strategies", tags=["strategies"])
+from app.core.streaming import iter_json_array
+
+router = APIRouter(prefix="/strategies", tags=["strategies"], default_response_class=ORJSONResponse)
+
+
+# This would typically come from a template service
+# For now, serve mock templates built once at import time
+STRATEGY_TEMPLATES = [
+    StrategyConfigTemplate(
+        strategy_type=StrategyType.TREND_FOLLOWING,
+        name="Simple Moving Average Crossover",
+        description="A basic trend following strategy using moving average crossovers",
+        default_config={
+            "fast_period": 10,
+            "slow_period": 20,
+            "signal_period": 5
+        },
+        default_parameters={
+            "risk_per_trade": 2.0,
+            "stop_loss_atr_multiplier": 2.0,
+            "take_profit_risk_reward_ratio": 2.0
+        },
+        required_config=["fast_period", "slow_period", "signal_period"],
+        optional_config=["volume_filter", "timeframe"],
+        config_schema={
+            "fast_period": {"type": "integer", "min": 5, "max": 50},
+            "slow_period": {"type": "integer", "min": 10, "max": 100},
+            "signal_period": {"type": "integer", "min": 1, "max": 20}
+        },
+        parameter_schema={
+            "risk_per_trade": {"type": "float", "min": 0.1, "max": 10.0},
+            "stop_loss_atr_multiplier": {"type": "float", "min": 1.0, "max": 5.0},
+            "take_profit_risk_reward_ratio": {"type": "float", "min": 1.0, "max": 5.0}
+        }
+    ),
+    StrategyConfigTemplate(
+        strategy_type=StrategyType.MEAN_REVERSION,
+        name="Bollinger Bands Mean Reversion",
+        description="A mean reversion strategy using Bollinger Bands",
+        default_config={
+            "period": 20,
+            "std_dev": 2.0
+        },
+        default_parameters={
+            "risk_per_trade": 2.0,
+            "stop_loss_atr_multiplier": 2.0,
+            "take_profit_risk_reward_ratio": 2.0
+        },
+        required_config=["period", "std_dev"],
+        optional_config=["volume_filter", "timeframe"],
+        config_schema={
+            "period": {"type": "integer", "min": 5, "max": 50},
+            "std_dev": {"type": "float", "min": 0.5, "max": 5.0}
+        },
+        parameter_schema={
+            "risk_per_trade": {"type": "float", "min": 0.1, "max": 10.0},
+            "stop_loss_atr_multiplier": {"type": "float", "min": 1.0, "max": 5.0},
+            "take_profit_risk_reward_ratio": {"type": "float", "min": 1.0, "max": 5.0}
+        }
+    ),
+    StrategyConfigTemplate(
+        strategy_type=StrategyType.MOMENTUM,
+        name="RSI Momentum",
+        description="A momentum strategy using RSI indicator",
+        default_config={
+            "rsi_period": 14,
+            "rsi_overbought": 70,
+            "rsi_oversold": 30
+        },
+        default_parameters={
+            "risk_per_trade": 2.0,
+            "stop_loss_atr_multiplier": 2.0,
+            "take_profit_risk_reward_ratio": 2.0
+        },
+        required_config=["rsi_period", "rsi_overbought", "rsi_oversold"],
+        optional_config=["volume_filter", "timeframe"],
+        config_schema={
+            "rsi_period": {"type": "integer", "min": 5, "max": 50},
+            "rsi_overbought": {"type": "integer", "min": 50, "max": 90},
+            "rsi_oversold": {"type": "integer", "min": 10, "max": 50}
+        },
+        parameter_schema={
+            "risk_per_trade": {"type": "float", "min": 0.1, "max": 10.0},
+            "stop_loss_atr_multiplier": {"type": "float", "min": 1.0, "max": 5.0},
+            "take_profit_risk_reward_ratio": {"type": "float", "min": 1.0, "max": 5.0}
+        }
+    )
+]
+
+# Templates indexed by strategy type, so a type filter is a lookup instead of a scan
+STRATEGY_TEMPLATES_BY_TYPE = {strategy_type: () for strategy_type in StrategyType}
+for _template in STRATEGY_TEMPLATES:
+    STRATEGY_TEMPLATES_BY_TYPE[_template.strategy_type] += (_template,)
+del _template
+
+# Pre-serialized template payloads, keyed by strategy type filter (None = all)
+_TEMPLATE_PAYLOADS = {
+    None: orjson.dumps([t.dict() for t in STRATEGY_TEMPLATES]),
+    **{
+        strategy_type: orjson.dumps([t.dict() for t in templates])
+        for strategy_type, templates in STRATEGY_TEMPLATES_BY_TYPE.items()
+    }
+}
+
+# Strong ETags for the template payloads, so pollers can revalidate with If-None-Match
+_TEMPLATE_ETAGS = {
+    key: f'"{hashlib.blake2b(payload, digest_size=8).hexdigest()}"'
+    for key, payload in _TEMPLATE_PAYLOADS.items()
+}
 
 
 def get_strategy_service(db: Session = Depends(get_db)) -> StrategyService:
@@ -30,6 +141,37 @@ def get_strategy_service(db: Session = Depends(get_db)) -> StrategyService:
     return StrategyService(db)
 
 
+# Backtest fields that can grow with the backtest date range
+BACKTEST_SERIES_FIELDS = ("equity_curve", "trade_history")
+
+# Lifecycle actions mapped to their audit event tense and 404 wording
+STRATEGY_TRANSITIONS = {
+    "start": ("started", "startable"),
+    "stop": ("stopped", "stoppable")
+}
+
+
+def _iter_backtest_json(backtest: StrategyBacktestResponse) -> Iterator[bytes]:
+    """Encode a backtest response, streaming its series in chunks"""
+    summary = orjson.dumps(backtest.dict(exclude=set(BACKTEST_SERIES_FIELDS)))
+    yield summary[:-1]
+    
+    for field in BACKTEST_SERIES_FIELDS:
+        series = getattr(backtest, field)
+        yield b',"' + field.encode() + b'":'
+        
+        if isinstance(series, dict):
+            # Columnar layout: stream each column as its own array
+            for index, (column, values) in enumerate(series.items()):
+                yield (b"{" if index == 0 else b",") + orjson.dumps(column) + b":"
+                yield from iter_json_array(values)
+            yield b"}" if series else b"{}"
+        else:
+            yield from iter_json_array(series)
+    
+    yield b"}"
+
+
 @router.post("/", response_model=StrategyResponse, status_code=status.HTTP_201_CREATED)
 async def create_strategy(
     strategy_data: StrategyCreate,
@@ -163,34 +305,77 @@ async def delete_strategy(
         )
 
 
+# Fixed paths are declared before /{strategy_id}, which would otherwise
+# capture them as a (non-integer) strategy id
+@router.get("/health")
+async def strategy_health_check():
+    """Strategy service health check"""
+    return {
+        "status": "healthy",
+        "service": "strategies",
+        "timestamp": datetime.utcnow()
+    }
+
+
+@router.get("/templates", response_model=List[StrategyConfigTemplate])
+@handle_errors("Failed to get strategy templates")
+async def get_strategy_templates(
+    strategy_type: Optional[StrategyType] = Query(None, description="Filter by strategy type"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get strategy configuration templates"""
+    etag = _TEMPLATE_ETAGS[strategy_type]
+    
+    # Client already has this payload
+    if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    return Response(
+        content=_TEMPLATE_PAYLOADS[strategy_type],
+        media_type="application/json",
+        headers={"ETag": etag}
+    )
+
+
+@router.get("/stats", response_model=StrategyStats)
+@handle_errors("Failed to get strategy stats")
+async def get_strategy_stats(
+    current_user: User = Depends(get_current_user_from_token),
+    strategy_service: StrategyService = Depends(get_strategy_service)
+):
+    """Get strategy statistics"""
+    stats = await strategy_service.get_strategy_stats(current_user.id)
+    
+    if not stats:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Strategy stats not found"
+        )
+    
+    return stats
+
+
 @router.get("/{strategy_id}", response_model=StrategyResponse)
+@handle_errors("Failed to get strategy")
 async def get_strategy(
     strategy_id: int,
     current_user: User = Depends(get_current_user_from_token),
     strategy_service: StrategyService = Depends(get_strategy_service)
 ):
     """Get strategy by ID"""
-    try:
-        strategy = await strategy_service.get_strategy(strategy_id, current_user.id)
-        
-        if not strategy:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Strategy not found"
-            )
-        
-        return StrategyResponse.from_orm(strategy)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    strategy = await strategy_service.get_strategy(strategy_id, current_user.id)
+    
+    if not strategy:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get strategy"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Strategy not found"
         )
+    
+    return StrategyResponse.from_orm(strategy)
 
 
 @router.get("/", response_model=dict)
+@handle_errors("Failed to get strategies")
 async def get_strategies(
     strategy_type: Optional[StrategyType] = Query(None, description="Filter by strategy type"),
     status: Optional[StrategyStatus] = Query(None, description="Filter by status"),
@@ -203,60 +388,57 @@ async def get_strategies(
     strategy_service: StrategyService = Depends(get_strategy_service)
 ):
     """Get user strategies with pagination"""
-    try:
-        request = StrategyListRequest(
-            strategy_type=strategy_type,
-            status=status,
-            execution_mode=execution_mode,
-            symbol=symbol,
-            created_by=created_by,
-            page=page,
-            per_page=per_page
-        )
-        
-        strategies, total = await strategy_service.get_strategies(current_user.id, request)
-        
-        return {
-            "strategies": [StrategyResponse.from_orm(strategy) for strategy in strategies],
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get strategies"
-        )
-
-
-@router.post("/{strategy_id}/start", response_model=StrategyResponse)
-async def start_strategy(
+    # Query parameters were already validated by FastAPI
+    request = StrategyListRequest.construct(
+        strategy_type=strategy_type,
+        status=status,
+        execution_mode=execution_mode,
+        symbol=symbol,
+        created_by=created_by,
+        page=page,
+        per_page=per_page
+    )
+    
+    strategies, total = await strategy_service.get_strategies(current_user.id, request)
+    
+    return ORJSONResponse({
+        "strategies": [StrategyResponse.from_orm(strategy).dict() for strategy in strategies],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": (total + per_page - 1) // per_page
+    })
+
+
+async def _transition_strategy(
+    action: str,
+    transition: Callable[[int, int], Awaitable[Optional[Strategy]]],
     strategy_id: int,
-    current_user: User = Depends(get_current_user_from_token),
-    strategy_service: StrategyService = Depends(get_strategy_service)
-):
-    """Start a strategy"""
+    current_user: User
+) -> StrategyResponse:
+    """Start or stop a strategy and audit the transition"""
+    past_tense, able = STRATEGY_TRANSITIONS[action]
     try:
-        # Start strategy
-        strategy = await strategy_service.start_strategy(strategy_id, current_user.id)
+        strategy = await transition(strategy_id, current_user.id)
         
         if not strategy:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail="Strategy not found or not startable"
+                detail=f"Strategy not found or not {able}"
             )
         
+        details = {
+            "strategy_id": strategy_id,
+            "name": strategy.name
+        }
+        if action == "start":
+            details["execution_mode"] = strategy.execution_mode
+        
         log_security_event(
-            "strategy_started",
+            f"strategy_{past_tense}",
             user_id=current_user.id,
             ip_address=None,
-            details={
-                "strategy_id": strategy_id,
-                "name": strategy.name,
-                "execution_mode": strategy.execution_mode
-            }
+            details=details
         )
         
         return StrategyResponse.from_orm(strategy)
@@ -265,17 +447,27 @@ async def start_strategy(
         raise
     except Exception as e:
         log_security_event(
-            "strategy_start_failed",
+            f"strategy_{action}_failed",
             user_id=current_user.id,
             ip_address=None,
             details={"error": str(e)}
         )
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to start strategy"
+            detail=f"Failed to {action} strategy"
         )
 
 
+@router.post("/{strategy_id}/start", response_model=StrategyResponse)
+async def start_strategy(
+    strategy_id: int,
+    current_user: User = Depends(get_current_user_from_token),
+    strategy_service: StrategyService = Depends(get_strategy_service)
+):
+    """Start a strategy"""
+    return await _transition_strategy("start", strategy_service.start_strategy, strategy_id, current_user)
+
+
 @router.post("/{strategy_id}/stop", response_model=StrategyResponse)
 async def stop_strategy(
     strategy_id: int,
@@ -283,41 +475,7 @@ async def stop_strategy(
     strategy_service: StrategyService = Depends(get_strategy_service)
 ):
     """Stop a strategy"""
-    try:
-        # Stop strategy
-        strategy = await strategy_service.stop_strategy(strategy_id, current_user.id)
-        
-        if not strategy:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Strategy not found or not stoppable"
-            )
-        
-        log_security_event(
-            "strategy_stopped",
-            user_id=current_user.id,
-            ip_address=None,
-            details={
-                "strategy_id": strategy_id,
-                "name": strategy.name
-            }
-        )
-        
-        return StrategyResponse.from_orm(strategy)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        log_security_event(
-            "strategy_stop_failed",
-            user_id=current_user.id,
-            ip_address=None,
-            details={"error": str(e)}
-        )
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to stop strategy"
-        )
+    return await _transition_strategy("stop", strategy_service.stop_strategy, strategy_id, current_user)
 
 
 @router.post("/{strategy_id}/clone", response_model=StrategyResponse, status_code=status.HTTP_201_CREATED)
@@ -397,10 +555,19 @@ async def backtest_strategy(
             }
         )
         
-        return backtest_result
+        return StreamingResponse(
+            _iter_backtest_json(backtest_result),
+            status_code=status.HTTP_201_CREATED,
+            media_type="application/json"
+        )
         
     except HTTPException:
         raise
+    except BacktestPeriodTooShort as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
     except Exception as e:
         log_security_event(
             "strategy_backtest_failed",
@@ -415,6 +582,7 @@ async def backtest_strategy(
 
 
 @router.get("/{strategy_id}/performance", response_model=dict)
+@handle_errors("Failed to get strategy performance")
 async def get_strategy_performance(
     strategy_id: int,
     start_date: Optional[datetime] = Query(None, description="Start date filter"),
@@ -425,161 +593,24 @@ async def get_strategy_performance(
     strategy_service: StrategyService = Depends(get_strategy_service)
 ):
     """Get strategy performance with pagination"""
-    try:
-        request = StrategyPerformanceRequest(
-            start_date=start_date,
-            end_date=end_date,
-            page=page,
-            per_page=per_page
-        )
-        
-        performance_records, total = await strategy_service.get_strategy_performance(strategy_id, request, current_user.id)
-        
-        return {
-            "performance": [record.to_dict() for record in performance_records],
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get strategy performance"
-        )
-
-
-@router.get("/templates", response_model=List[StrategyConfigTemplate])
-async def get_strategy_templates(
-    strategy_type: Optional[StrategyType] = Query(None, description="Filter by strategy type"),
-    strategy_service: StrategyService = Depends(get_strategy_service)
-):
-    """Get strategy configuration templates"""
-    try:
-        # This would typically come from a template service
-        # For now, return mock templates
-        templates = [
-            StrategyConfigTemplate(
-                strategy_type=StrategyType.TREND_FOLLOWING,
-                name="Simple Moving Average Crossover",
-                description="A basic trend following strategy using moving average crossovers",
-                default_config={
-                    "fast_period": 10,
-                    "slow_period": 20,
-                    "signal_period": 5
-                },
-                default_parameters={
-                    "risk_per_trade": 2.0,
-                    "stop_loss_atr_multiplier": 2.0,
-                    "take_profit_risk_reward_ratio": 2.0
-                },
-                required_config=["fast_period", "slow_period", "signal_period"],
-                optional_config=["volume_filter", "timeframe"],
-                config_schema={
-                    "fast_period": {"type": "integer", "min": 5, "max": 50},
-                    "slow_period": {"type": "integer", "min": 10, "max": 100},
-                    "signal_period": {"type": "integer", "min": 1, "max": 20}
-                },
-                parameter_schema={
-                    "risk_per_trade": {"type": "float", "min": 0.1, "max": 10.0},
-                    "stop_loss_atr_multiplier": {"type": "float", "min": 1.0, "max": 5.0},
-                    "take_profit_risk_reward_ratio": {"type": "float", "min": 1.0, "max": 5.0}
-                }
-            ),
-            StrategyConfigTemplate(
-                strategy_type=StrategyType.MEAN_REVERSION,
-                name="Bollinger Bands Mean Reversion",
-                description="A mean reversion strategy using Bollinger Bands",
-                default_config={
-                    "period": 20,
-                    "std_dev": 2.0
-                },
-                default_parameters={
-                    "risk_per_trade": 2.0,
-                    "stop_loss_atr_multiplier": 2.0,
-                    "take_profit_risk_reward_ratio": 2.0
-                },
-                required_config=["period", "std_dev"],
-                optional_config=["volume_filter", "timeframe"],
-                config_schema={
-                    "period": {"type": "integer", "min": 5, "max": 50},
-                    "std_dev": {"type": "float", "min": 0.5, "max": 5.0}
-                },
-                parameter_schema={
-                    "risk_per_trade": {"type": "float", "min": 0.1, "max": 10.0},
-                    "stop_loss_atr_multiplier": {"type": "float", "min": 1.0, "max": 5.0},
-                    "take_profit_risk_reward_ratio": {"type": "float", "min": 1.0, "max": 5.0}
-                }
-            ),
-            StrategyConfigTemplate(
-                strategy_type=StrategyType.MOMENTUM,
-                name="RSI Momentum",
-                description="A momentum strategy using RSI indicator",
-                default_config={
-                    "rsi_period": 14,
-                    "rsi_overbought": 70,
-                    "rsi_oversold": 30
-                },
-                default_parameters={
-                    "risk_per_trade": 2.0,
-                    "stop_loss_atr_multiplier": 2.0,
-                    "take_profit_risk_reward_ratio": 2.0
-                },
-                required_config=["rsi_period", "rsi_overbought", "rsi_oversold"],
-                optional_config=["volume_filter", "timeframe"],
-                config_schema={
-                    "rsi_period": {"type": "integer", "min": 5, "max": 50},
-                    "rsi_overbought": {"type": "integer", "min": 50, "max": 90},
-                    "rsi_oversold": {"type": "integer", "min": 10, "max": 50}
-                },
-                parameter_schema={
-                    "risk_per_trade": {"type": "float", "min": 0.1, "max": 10.0},
-                    "stop_loss_atr_multiplier": {"type": "float", "min": 1.0, "max": 5.0},
-                    "take_profit_risk_reward_ratio": {"type": "float", "min": 1.0, "max": 5.0}
-                }
-            )
-        ]
-        
-        # Filter by strategy type if specified
-        if strategy_type:
-            templates = [t for t in templates if t.strategy_type == strategy_type]
-        
-        return templates
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get strategy templates"
-        )
-
-
-@router.get("/stats", response_model=StrategyStats)
-async def get_strategy_stats(
-    current_user: User = Depends(get_current_user_from_token),
-    strategy_service: StrategyService = Depends(get_strategy_service)
-):
-    """Get strategy statistics"""
-    try:
-        stats = await strategy_service.get_strategy_stats(current_user.id)
-        
-        if not stats:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Strategy stats not found"
-            )
-        
-        return stats
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get strategy stats"
-        )
+    # Query parameters were already validated by FastAPI
+    request = StrategyPerformanceRequest.construct(
+        start_date=start_date,
+        end_date=end_date,
+        page=page,
+        per_page=per_page
+    )
+    
+    performance_records, total = await strategy_service.get_strategy_performance(strategy_id, request, current_user.id)
+    
+    # Records are column dicts; orjson writes their datetimes as ISO 8601
+    return ORJSONResponse({
+        "performance": performance_records,
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": (total + per_page - 1) // per_page
+    })
 
 
 @router.post("/{strategy_id}/alerts", response_model=dict, status_code=status.HTTP_201_CREATED)
@@ -592,9 +623,7 @@ async def create_strategy_alert(
     """Create a strategy alert"""
     try:
         # Verify strategy ownership
-        strategy = await strategy_service.get_strategy(strategy_id, current_user.id)
-        
-        if not strategy:
+        if not await strategy_service.owns_strategy(strategy_id, current_user.id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Strategy not found"
@@ -634,13 +663,3 @@ async def create_strategy_alert(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create strategy alert"
         )
-
-
-@router.get("/health")
-async def strategy_health_check():
-    """Strategy service health check"""
-    return {
-        "status": "healthy",
-        "service": "strategies",
-        "timestamp": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
@@ -3,25 +3,30 @@ VELOX-N8N Trading API
 REST API endpoints for trading operations and order management
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 from app.core.database import get_db
 from app.core.security import get_current_user_from_token
 from app.models.user import User
 from app.models.trade import TradeStatus, OrderSide, OrderType, PositionType
-from app.services.trading_service import TradingService
+from app.services.trading_service import TradingService, MarketDataService
 from app.schemas.trading import (
     OrderCreate, OrderUpdate, OrderCancel, OrderResponse,
     PositionResponse, PortfolioSummary, TradeHistoryRequest,
     PositionHistoryRequest, OrderBookRequest, OrderBookResponse,
     MarketStats, TradingAnalytics
 )
+from app.core.errors import handle_errors
 from app.core.logging import log_api_request, log_security_event
 
-router = APIRouter(prefix="/trading", tags=["trading"])
+router = APIRouter(prefix="/trading", tags=["trading"], default_response_class=ORJSONResponse)
+
+# Most symbols served by one batch market data request
+MARKET_BATCH_LIMIT = 50
 
 
 def get_trading_service(db: Session = Depends(get_db)) -> TradingService:
@@ -29,6 +34,31 @@ def get_trading_service(db: Session = Depends(get_db)) -> TradingService:
     return TradingService(db)
 
 
+def get_market_data_service(request: Request) -> MarketDataService:
+    """Get the market data service created at startup"""
+    return request.app.state.market_data_service
+
+
+def get_batch_symbols(symbols: List[str] = Query(..., description="Trading symbols")) -> List[str]:
+    """Get the distinct symbols of a batch market data request, within the batch limit"""
+    symbols = list(dict.fromkeys(symbols))
+    if len(symbols) > MARKET_BATCH_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"At most {MARKET_BATCH_LIMIT} symbols per request"
+        )
+    return symbols
+
+
+def get_order_book_request(
+    symbol: str = Query(..., description="Trading symbol"),
+    exchange: str = Query(..., description="Exchange name"),
+    depth: int = Query(5, ge=1, le=20, description="Order book depth")
+) -> OrderBookRequest:
+    """Get the order book request from its query params, validated once by FastAPI"""
+    return OrderBookRequest.construct(symbol=symbol, exchange=exchange, depth=depth)
+
+
 @router.post("/orders", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
 async def create_order(
     order_data: OrderCreate,
@@ -168,33 +198,26 @@ async def cancel_order(
 
 
 @router.get("/orders/{order_id}", response_model=OrderResponse)
+@handle_errors("Failed to get order")
 async def get_order(
     order_id: str,
     current_user: User = Depends(get_current_user_from_token),
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get order by ID"""
-    try:
-        trade = await trading_service.get_order(order_id, current_user.id)
-        
-        if not trade:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Order not found"
-            )
-        
-        return OrderResponse.from_orm(trade)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    trade = await trading_service.get_order(order_id, current_user.id)
+    
+    if not trade:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get order"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order not found"
         )
+    
+    return OrderResponse.from_orm(trade)
 
 
-@router.get("/orders", response_model=List[OrderResponse])
+@router.get("/orders", responses={200: {"model": List[OrderResponse]}})
+@handle_errors("Failed to get orders")
 async def get_orders(
     status: Optional[TradeStatus] = Query(None, description="Filter by order status"),
     symbol: Optional[str] = Query(None, description="Filter by symbol"),
@@ -203,18 +226,15 @@ async def get_orders(
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get user orders"""
-    try:
-        trades = await trading_service.get_orders(current_user.id, status, symbol, limit)
-        return [OrderResponse.from_orm(trade) for trade in trades]
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get orders"
-        )
+    trades = await trading_service.get_orders(current_user.id, status, symbol, limit)
+    
+    # Converted here, while the session is open and errors can still become a 500;
+    # the orders were validated by from_orm, so they are encoded without re-validation
+    return ORJSONResponse([OrderResponse.from_orm(trade).dict() for trade in trades])
 
 
 @router.get("/orders/history", response_model=dict)
+@handle_errors("Failed to get trade history")
 async def get_trade_history(
     symbol: Optional[str] = Query(None, description="Filter by symbol"),
     exchange: Optional[str] = Query(None, description="Filter by exchange"),
@@ -230,80 +250,63 @@ async def get_trade_history(
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get trade history with pagination"""
-    try:
-        request = TradeHistoryRequest(
-            symbol=symbol,
-            exchange=exchange,
-            order_type=order_type,
-            order_side=order_side,
-            status=status,
-            strategy_id=strategy_id,
-            start_date=start_date,
-            end_date=end_date,
-            page=page,
-            per_page=per_page
-        )
-        
-        trades, total = await trading_service.get_trade_history(request, current_user.id)
-        
-        return {
-            "trades": [OrderResponse.from_orm(trade) for trade in trades],
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get trade history"
-        )
-
-
-@router.get("/positions", response_model=List[PositionResponse])
+    # Query parameters were already validated by FastAPI
+    request = TradeHistoryRequest.construct(
+        symbol=symbol,
+        exchange=exchange,
+        order_type=order_type,
+        order_side=order_side,
+        status=status,
+        strategy_id=strategy_id,
+        start_date=start_date,
+        end_date=end_date,
+        page=page,
+        per_page=per_page
+    )
+    
+    trades, total = await trading_service.get_trade_history(request, current_user.id)
+    
+    return ORJSONResponse({
+        "trades": [OrderResponse.from_orm(trade).dict() for trade in trades],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": (total + per_page - 1) // per_page
+    })
+
+
+@router.get("/positions", responses={200: {"model": List[PositionResponse]}})
+@handle_errors("Failed to get positions")
 async def get_positions(
     symbol: Optional[str] = Query(None, description="Filter by symbol"),
     current_user: User = Depends(get_current_user_from_token),
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get user positions"""
-    try:
-        positions = await trading_service.get_positions(current_user.id, symbol)
-        return [PositionResponse.from_orm(position) for position in positions]
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get positions"
-        )
+    positions = await trading_service.get_positions(current_user.id, symbol)
+    
+    # Converted here, while the session is open and errors can still become a 500;
+    # the positions were validated by from_orm, so they are encoded without re-validation
+    return ORJSONResponse([PositionResponse.from_orm(position).dict() for position in positions])
 
 
 @router.get("/positions/{position_id}", response_model=PositionResponse)
+@handle_errors("Failed to get position")
 async def get_position(
     position_id: int,
     current_user: User = Depends(get_current_user_from_token),
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get position by ID"""
-    try:
-        position = await trading_service.get_position(position_id, current_user.id)
-        
-        if not position:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Position not found"
-            )
-        
-        return PositionResponse.from_orm(position)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    position = await trading_service.get_position(position_id, current_user.id)
+    
+    if not position:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get position"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Position not found"
         )
+    
+    return PositionResponse.from_orm(position)
 
 
 @router.post("/positions/{position_id}/close", response_model=PositionResponse)
@@ -352,6 +355,7 @@ async def close_position(
 
 
 @router.get("/positions/history", response_model=dict)
+@handle_errors("Failed to get position history")
 async def get_position_history(
     symbol: Optional[str] = Query(None, description="Filter by symbol"),
     exchange: Optional[str] = Query(None, description="Filter by exchange"),
@@ -366,126 +370,120 @@ async def get_position_history(
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get position history with pagination"""
-    try:
-        request = PositionHistoryRequest(
-            symbol=symbol,
-            exchange=exchange,
-            position_type=position_type,
-            status=status,
-            strategy_id=strategy_id,
-            start_date=start_date,
-            end_date=end_date,
-            page=page,
-            per_page=per_page
-        )
-        
-        positions, total = await trading_service.get_position_history(request, current_user.id)
-        
-        return {
-            "positions": [PositionResponse.from_orm(position) for position in positions],
-            "total": total,
-            "page": page,
-            "per_page": per_page,
-            "total_pages": (total + per_page - 1) // per_page
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get position history"
-        )
+    # Query parameters were already validated by FastAPI
+    request = PositionHistoryRequest.construct(
+        symbol=symbol,
+        exchange=exchange,
+        position_type=position_type,
+        status=status,
+        strategy_id=strategy_id,
+        start_date=start_date,
+        end_date=end_date,
+        page=page,
+        per_page=per_page
+    )
+    
+    positions, total = await trading_service.get_position_history(request, current_user.id)
+    
+    return ORJSONResponse({
+        "positions": [PositionResponse.from_orm(position).dict() for position in positions],
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": (total + per_page - 1) // per_page
+    })
 
 
 @router.get("/portfolio/summary", response_model=PortfolioSummary)
+@handle_errors("Failed to get portfolio summary")
 async def get_portfolio_summary(
     current_user: User = Depends(get_current_user_from_token),
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get portfolio summary"""
-    try:
-        summary = await trading_service.get_portfolio_summary(current_user.id)
-        
-        if not summary:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Portfolio summary not found"
-            )
-        
-        return summary
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    summary = await trading_service.get_portfolio_summary(current_user.id)
+    
+    if not summary:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get portfolio summary"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Portfolio summary not found"
         )
+    
+    return summary
 
 
-@router.get("/market/orderbook", response_model=OrderBookResponse)
+@router.get("/market/orderbook", responses={200: {"model": OrderBookResponse}})
+@handle_errors("Failed to get order book")
 async def get_order_book(
-    symbol: str = Query(..., description="Trading symbol"),
-    exchange: str = Query(..., description="Exchange name"),
-    depth: int = Query(5, ge=1, le=20, description="Order book depth"),
+    request: OrderBookRequest = Depends(get_order_book_request),
     current_user: User = Depends(get_current_user_from_token),
-    trading_service: TradingService = Depends(get_trading_service)
+    market_data_service: MarketDataService = Depends(get_market_data_service)
 ):
     """Get order book for symbol"""
-    try:
-        request = OrderBookRequest(
-            symbol=symbol,
-            exchange=exchange,
-            depth=depth
-        )
-        
-        order_book = await trading_service.get_order_book(request)
-        
-        if not order_book:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Order book not found"
-            )
-        
-        return OrderBookResponse(**order_book)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    order_book = await market_data_service.get_order_book(request)
+    
+    if not order_book:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get order book"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Order book not found"
         )
+    
+    # Built by the service from market data, so it goes out without re-validation
+    return ORJSONResponse(order_book)
 
 
-@router.get("/market/stats", response_model=MarketStats)
+@router.get("/market/orderbook/batch", responses={200: {"model": Dict[str, OrderBookResponse]}})
+@handle_errors("Failed to get order books")
+async def get_order_book_batch(
+    symbols: List[str] = Depends(get_batch_symbols),
+    exchange: str = Query(..., description="Exchange name"),
+    depth: int = Query(5, ge=1, le=20, description="Order book depth"),
+    current_user: User = Depends(get_current_user_from_token),
+    market_data_service: MarketDataService = Depends(get_market_data_service)
+):
+    """Get order books for several symbols in one request"""
+    order_books = await market_data_service.get_order_book_batch(symbols, exchange, depth)
+    
+    return ORJSONResponse(order_books)
+
+
+@router.get("/market/stats", responses={200: {"model": MarketStats}})
+@handle_errors("Failed to get market stats")
 async def get_market_stats(
     symbol: str = Query(..., description="Trading symbol"),
     exchange: str = Query(..., description="Exchange name"),
     current_user: User = Depends(get_current_user_from_token),
-    trading_service: TradingService = Depends(get_trading_service)
+    market_data_service: MarketDataService = Depends(get_market_data_service)
 ):
     """Get market statistics for symbol"""
-    try:
-        stats = await trading_service.get_market_stats(symbol, exchange)
-        
-        if not stats:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Market stats not found"
-            )
-        
-        return stats
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    stats = await market_data_service.get_market_stats(symbol, exchange)
+    
+    if not stats:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get market stats"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Market stats not found"
         )
+    
+    # Cached stats were validated once when fetched
+    return ORJSONResponse(stats.dict())
+
+
+@router.get("/market/stats/batch", responses={200: {"model": Dict[str, MarketStats]}})
+@handle_errors("Failed to get market stats")
+async def get_market_stats_batch(
+    symbols: List[str] = Depends(get_batch_symbols),
+    exchange: str = Query(..., description="Exchange name"),
+    current_user: User = Depends(get_current_user_from_token),
+    market_data_service: MarketDataService = Depends(get_market_data_service)
+):
+    """Get market statistics for several symbols in one request"""
+    stats = await market_data_service.get_market_stats_batch(symbols, exchange)
+    
+    return ORJSONResponse({symbol: symbol_stats.dict() for symbol, symbol_stats in stats.items()})
 
 
 @router.get("/analytics", response_model=TradingAnalytics)
+@handle_errors("Failed to get trading analytics")
 async def get_trading_analytics(
     start_date: datetime = Query(..., description="Start date for analytics"),
     end_date: datetime = Query(..., description="End date for analytics"),
@@ -493,45 +491,30 @@ async def get_trading_analytics(
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Get trading analytics for period"""
-    try:
-        analytics = await trading_service.get_trading_analytics(
-            current_user.id, start_date, end_date
-        )
-        
-        if not analytics:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No trading data found for the specified period"
-            )
-        
-        return analytics
-        
-    except HTTPException:
-        raise
-    except Exception as e:
+    analytics = await trading_service.get_trading_analytics(
+        current_user.id, start_date, end_date
+    )
+    
+    if not analytics:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to get trading analytics"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No trading data found for the specified period"
         )
+    
+    return analytics
 
 
 @router.post("/market/price-update")
+@handle_errors("Failed to update market price")
 async def update_market_price(
     symbol: str,
     price: float,
     trading_service: TradingService = Depends(get_trading_service)
 ):
     """Update market price (internal endpoint)"""
-    try:
-        await trading_service.process_market_data_update(symbol, price)
-        
-        return {"message": "Market price updated successfully"}
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to update market price"
-        )
+    await trading_service.process_market_data_update(symbol, price)
+    
+    return {"message": "Market price updated successfully"}
 
 
 @router.get("/health")
@@ -540,5 +523,5 @@ async def trading_health_check():
     return {
         "status": "healthy",
         "service": "trading",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow()
     }
\ No newline at end of file
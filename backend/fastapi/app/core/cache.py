@@ -0,0 +1,155 @@
+"""
+VELOX-N8N Cache
+In-process TTL cache for expensive lookups
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+import asyncio
+import time
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+def _retrieve_exception(load: asyncio.Task):
+    """
+    Mark a failed load's exception retrieved in case every caller was cancelled
+    """
+    if not load.cancelled():
+        load.exception()
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a time-to-live
+    """
+
+    def __init__(self, ttl: float = settings.CACHE_TTL, max_size: int = settings.CACHE_MAX_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.enabled = settings.CACHE_ENABLED
+
+        # Entries are stored as key -> (expires_at, value), oldest first
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+        # Pending loads, so concurrent misses for a key share one call
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+
+        # Performance tracking
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value, or default if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value, evicting the least recently used entries when full
+        """
+        if not self.enabled:
+            return
+
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def get_or_set(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[float] = None
+    ) -> Any:
+        """
+        Get a cached value, or await factory() once and share the result
+        with every concurrent caller asking for the same key
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        # The load runs as its own task and every caller, including the one
+        # that started it, awaits it shielded, so cancelling one caller
+        # neither cancels the load nor fails the others waiting on it
+        load = self._inflight.get(key)
+        if load is None:
+            load = asyncio.create_task(self._load(key, factory, ttl))
+            load.add_done_callback(_retrieve_exception)
+            self._inflight[key] = load
+        return await asyncio.shield(load)
+
+    async def _load(
+        self,
+        key: Hashable,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: Optional[float]
+    ) -> Any:
+        """
+        Await factory() for a key and cache the result, unless the key was
+        invalidated while it loaded
+        """
+        load = asyncio.current_task()
+        try:
+            value = await factory()
+        finally:
+            current = self._inflight.get(key) is load
+            if current:
+                del self._inflight[key]
+
+        # An invalidation during the load already dropped it from _inflight;
+        # its result may predate the change, so the waiters get it but it is
+        # not cached
+        if current:
+            self.set(key, value, ttl)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """
+        Remove a single entry, or every entry when no key is given; loads
+        already in flight for them are not cached when they finish
+        """
+        if key is None:
+            self._entries.clear()
+            self._inflight.clear()
+        else:
+            self._entries.pop(key, None)
+            self._inflight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "inflight": len(self._inflight)
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -79,11 +79,14 @@ class Settings(BaseSettings):
     CACHE_TTL: int = 3600
     CACHE_MAX_SIZE: int = 1000
     CACHE_ENABLED: bool = True
+    MARKET_DATA_CACHE_TTL: int = 5
+    ANALYTICS_CACHE_TTL: int = 30
     
     # WebSocket Configuration
     WS_HEARTBEAT_INTERVAL: int = 30
     WS_MAX_CONNECTIONS: int = 1000
     WS_MESSAGE_QUEUE_SIZE: int = 10000
+    WS_BATCH_WINDOW: float = 0.002  # Seconds a market data burst may accumulate before it is sent
     
     # Trading Configuration
     MAX_POSITION_SIZE: float = 100000.0
@@ -163,6 +166,7 @@ class WebSocketSettings:
     HEARTBEAT_INTERVAL = settings.WS_HEARTBEAT_INTERVAL
     MAX_CONNECTIONS = settings.WS_MAX_CONNECTIONS
     MESSAGE_QUEUE_SIZE = settings.WS_MESSAGE_QUEUE_SIZE
+    BATCH_WINDOW = settings.WS_BATCH_WINDOW
     PING_TIMEOUT = 10
     PONG_TIMEOUT = 10
 
@@ -177,6 +181,7 @@ class TradingSettings:
     DEFAULT_RISK_PERCENT = 2.0
     DEFAULT_STOP_LOSS_ATR_MULTIPLIER = 2.0
     DEFAULT_TAKE_PROFIT_RISK_REWARD_RATIO = 2.0
+    ANALYTICS_CACHE_TTL = settings.ANALYTICS_CACHE_TTL
 
 
 class MarketDataSettings:
@@ -188,6 +193,10 @@ class MarketDataSettings:
     TICK_BUFFER_SIZE = settings.TICK_BUFFER_SIZE
     UPDATE_INTERVAL = settings.UPDATE_INTERVAL
     DATA_RETENTION_DAYS = settings.DATA_RETENTION_DAYS
+    CACHE_TTL = settings.MARKET_DATA_CACHE_TTL
+    MAX_CONNECTIONS = 100
+    MAX_KEEPALIVE_CONNECTIONS = 20
+    MAX_CONCURRENT_FETCHES = 10
 
 
 class SecuritySettings:
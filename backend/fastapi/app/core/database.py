@@ -8,6 +8,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 import logging
+import time
 from typing import Generator
 
 from app.core.config import db_settings
@@ -218,7 +219,6 @@ async def db_health_check():
         health_info["status"] = "unhealthy"
         health_info["details"]["error"] = str(e)
     
-    import time
     health_info["timestamp"] = time.time()
     
     return health_info
@@ -0,0 +1,32 @@
+"""
+VELOX-N8N Error Handling
+Shared error handling for API endpoints
+"""
+
+from typing import Any, Awaitable, Callable
+from functools import wraps
+from fastapi import HTTPException, status
+
+
+def handle_errors(detail: str) -> Callable:
+    """
+    Decorate an endpoint so HTTP errors pass through unchanged and any
+    other exception becomes a 500 with the given detail
+    """
+    def decorator(endpoint: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        # wraps() keeps the endpoint's signature visible to FastAPI's dependency injection
+        @wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail=detail
+                )
+
+        return wrapper
+
+    return decorator
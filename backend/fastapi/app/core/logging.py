@@ -5,10 +5,14 @@ Centralized logging setup for the trading system
 
 import logging
 import logging.handlers
+import json
 import os
 import sys
+import time
+from functools import lru_cache
 from typing import Optional
 from pathlib import Path
+from fastapi import Request
 
 from app.core.config import settings
 
@@ -29,11 +33,11 @@ def setup_logging():
     logger.handlers.clear()
     
     # Create formatters
-    detailed_formatter = logging.Formatter(
+    detailed_formatter = CachedTimeFormatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s:%(lineno)d - %(message)s'
     )
     
-    simple_formatter = logging.Formatter(
+    simple_formatter = CachedTimeFormatter(
         '%(asctime)s - %(levelname)s - %(message)s'
     )
     
@@ -141,9 +145,43 @@ def _parse_size(size_str: str) -> int:
         return int(size_str)
 
 
+@lru_cache(maxsize=2)
+def _format_second(second: int) -> str:
+    """
+    Format a whole epoch second the way logging.Formatter.formatTime does
+    """
+    return time.strftime(logging.Formatter.default_time_format, time.localtime(second))
+
+
+def _log_timestamp() -> str:
+    """
+    Get the current log timestamp, reusing the formatted string within a second
+    """
+    now = time.time()
+    second = int(now)
+    return logging.Formatter.default_msec_format % (_format_second(second), (now - second) * 1000)
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter whose asctime reuses the formatted string within a second,
+    instead of running strftime for every record on every handler
+    """
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        """
+        Format the record time, falling back to strftime for a custom datefmt
+        """
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        return self.default_msec_format % (_format_second(int(record.created)), record.msecs)
+
+
+@lru_cache(maxsize=None)
 def get_logger(name: str) -> logging.Logger:
     """
-    Get a logger with the specified name
+    Get a logger with the specified name; loggers live for the whole
+    process, so each name is resolved through the logging module once
     """
     return logging.getLogger(f"velox_n8n.{name}")
 
@@ -155,10 +193,7 @@ def log_trading_event(event_type: str, data: dict, user_id: Optional[int] = None
     trading_logger = get_logger("trading")
     log_data = {
         "event_type": event_type,
-        "timestamp": logging.Formatter().formatTime(logging.LogRecord(
-            name="", level=logging.INFO, pathname="", lineno=0,
-            msg="", args=(), exc_info=None
-        )),
+        "timestamp": _log_timestamp(),
         "data": data
     }
     
@@ -185,10 +220,7 @@ def log_api_request(
         "endpoint": endpoint,
         "status_code": status_code,
         "response_time_ms": response_time * 1000,
-        "timestamp": logging.Formatter().formatTime(logging.LogRecord(
-            name="", level=logging.INFO, pathname="", lineno=0,
-            msg="", args=(), exc_info=None
-        ))
+        "timestamp": _log_timestamp()
     }
     
     if user_id:
@@ -208,10 +240,7 @@ def log_system_event(event_type: str, message: str, data: Optional[dict] = None)
     log_data = {
         "event_type": event_type,
         "message": message,
-        "timestamp": logging.Formatter().formatTime(logging.LogRecord(
-            name="", level=logging.INFO, pathname="", lineno=0,
-            msg="", args=(), exc_info=None
-        ))
+        "timestamp": _log_timestamp()
     }
     
     if data:
@@ -237,10 +266,7 @@ def log_security_event(
         "ip_address": ip_address,
         "details": details,
         "severity": severity,
-        "timestamp": logging.Formatter().formatTime(logging.LogRecord(
-            name="", level=logging.INFO, pathname="", lineno=0,
-            msg="", args=(), exc_info=None
-        ))
+        "timestamp": _log_timestamp()
     }
     
     security_logger.info(f"Security Event: {event_type}", extra={"log_data": log_data})
@@ -260,10 +286,7 @@ def log_performance_metric(
         "metric_name": metric_name,
         "value": value,
         "unit": unit,
-        "timestamp": logging.Formatter().formatTime(logging.LogRecord(
-            name="", level=logging.INFO, pathname="", lineno=0,
-            msg="", args=(), exc_info=None
-        ))
+        "timestamp": _log_timestamp()
     }
     
     if tags:
@@ -285,10 +308,7 @@ def log_error(
     log_data = {
         "error_type": error_type,
         "message": message,
-        "timestamp": logging.Formatter().formatTime(logging.LogRecord(
-            name="", level=logging.ERROR, pathname="", lineno=0,
-            msg="", args=(), exc_info=None
-        ))
+        "timestamp": _log_timestamp()
     }
     
     if exception:
@@ -308,9 +328,6 @@ def create_request_logger():
     """
     Create a request logger middleware for FastAPI
     """
-    import time
-    from fastapi import Request
-    
     def log_request(request: Request, call_next):
         start_time = time.time()
         
@@ -340,9 +357,6 @@ def setup_structured_logging():
     Setup structured logging with JSON formatter for production
     """
     if settings.ENVIRONMENT == "production":
-        import json
-        import logging
-        
         class JSONFormatter(logging.Formatter):
             def format(self, record):
                 log_obj = {
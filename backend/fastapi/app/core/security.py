@@ -12,6 +12,8 @@ from fastapi.security import OAuth2PasswordBearer
 import secrets
 import hashlib
 import hmac
+import html
+import re
 
 from app.core.config import security_settings
 from app.core.logging import log_security_event
@@ -22,6 +24,29 @@ pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 # OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Precompiled validation patterns
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+NON_DIGIT_PATTERN = re.compile(r'[^\d]')
+
+# Passwords rejected outright by the strength check
+COMMON_PASSWORDS = frozenset({
+    "password", "123456", "123456789", "qwerty", "abc123",
+    "password123", "admin", "letmein", "welcome", "monkey"
+})
+
+# Characters that count towards the special-character score
+PASSWORD_SPECIAL_CHARS = frozenset("!@#$%^&*()_+-=[]{}|;:'\",.<>?/")
+
+# Leading digits of valid Indian mobile numbers
+INDIAN_MOBILE_PREFIXES = frozenset("6789")
+
+# Permissions granted to each user role
+ROLE_PERMISSIONS = {
+    "admin": frozenset({"read", "write", "delete", "manage_users", "manage_strategies", "manage_system"}),
+    "investor": frozenset({"read", "write", "manage_strategies"}),
+    "viewer": frozenset({"read"})
+}
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -207,16 +232,11 @@ def validate_password_strength(password: str) -> Dict[str, Any]:
     if any(c.isdigit() for c in password):
         score += 1
     
-    if any(c in "!@#$%^&*()_+-=[]{}|;:'\",.<>?/" for c in password):
+    if any(c in PASSWORD_SPECIAL_CHARS for c in password):
         score += 1
     
     # Common password check
-    common_passwords = [
-        "password", "123456", "123456789", "qwerty", "abc123",
-        "password123", "admin", "letmein", "welcome", "monkey"
-    ]
-    
-    if password.lower() in common_passwords:
+    if password.lower() in COMMON_PASSWORDS:
         errors.append("Password is too common")
         score -= 2
     
@@ -288,7 +308,6 @@ def sanitize_input(input_str: str) -> str:
     Sanitize user input to prevent XSS
     """
     # Basic HTML sanitization
-    import html
     return html.escape(input_str)
 
 
@@ -296,24 +315,20 @@ def validate_email(email: str) -> bool:
     """
     Validate email format
     """
-    import re
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return EMAIL_PATTERN.match(email) is not None
 
 
 def validate_phone_number(phone: str) -> bool:
     """
     Validate phone number format (Indian format)
     """
-    import re
     # Remove spaces and special characters
-    clean_phone = re.sub(r'[^\d]', '', phone)
+    clean_phone = NON_DIGIT_PATTERN.sub('', phone)
     
     # Check if it's 10 digits (Indian mobile number)
     if len(clean_phone) == 10 and clean_phone.isdigit():
         # Check if it starts with valid Indian mobile prefixes
-        valid_prefixes = ['6', '7', '8', '9']
-        return clean_phone[0] in valid_prefixes
+        return clean_phone[0] in INDIAN_MOBILE_PREFIXES
     
     return False
 
@@ -379,11 +394,4 @@ def check_permission(user_role: str, required_permission: str) -> bool:
     """
     Check if user role has required permission
     """
-    # Define role permissions
-    role_permissions = {
-        "admin": ["read", "write", "delete", "manage_users", "manage_strategies", "manage_system"],
-        "investor": ["read", "write", "manage_strategies"],
-        "viewer": ["read"]
-    }
-    
-    return required_permission in role_permissions.get(user_role, [])
\ No newline at end of file
+    return required_permission in ROLE_PERMISSIONS.get(user_role, frozenset())
\ No newline at end of file
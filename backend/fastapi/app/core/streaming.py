@@ -0,0 +1,26 @@
+"""
+VELOX-N8N Streaming
+Chunked JSON encoding for large response bodies
+"""
+
+from typing import Any, Iterator, Sequence
+import orjson
+
+# Number of items encoded per streamed chunk
+STREAM_CHUNK_SIZE = 4096
+
+
+def iter_json_array(
+    items: Sequence[Any],
+    chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Encode a sequence (or 1-D numpy array) as a JSON array one chunk at a
+    time
+    """
+    yield b"["
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start:start + chunk_size]
+        encoded = orjson.dumps(chunk, option=orjson.OPT_SERIALIZE_NUMPY)[1:-1]
+        yield encoded if start == 0 else b"," + encoded
+    yield b"]"
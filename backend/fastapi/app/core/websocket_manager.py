@@ -5,10 +5,10 @@ Real-time data streaming for indicators and market data
 
 from typing import Dict, List, Set, Optional
 from fastapi import WebSocket, WebSocketDisconnect
-import json
 import asyncio
+import orjson
 import logging
-from datetime import datetime
+from datetime import datetime, timedelta
 import weakref
 
 from app.core.config import ws_settings
@@ -32,8 +32,10 @@ class ConnectionManager:
         # Subscription management
         self.subscriptions: Dict[WebSocket, Set[str]] = {}
         
-        # Message queues
+        # Market data queues by symbol, each drained by one sender task that
+        # coalesces bursts into batch messages
         self.message_queues: Dict[str, asyncio.Queue] = {}
+        self.sender_tasks: Dict[str, asyncio.Task] = {}
         
         # Heartbeat management
         self.last_heartbeat: Dict[WebSocket, datetime] = {}
@@ -47,9 +49,10 @@ class ConnectionManager:
         self.message_count = 0
         self.error_count = 0
     
-    async def connect(self, websocket: WebSocket, symbol: str):
+    async def connect(self, websocket: WebSocket, symbol: str, batch: bool = False):
         """
-        Accept and register a new WebSocket connection
+        Accept and register a new WebSocket connection; batch opts it in to
+        receiving bursts of market data as market_data_batch messages
         """
         try:
             # Check connection limits
@@ -64,13 +67,17 @@ class ConnectionManager:
             
             self.active_connections[symbol].add(websocket)
             
+            # One clock reading for the metadata, heartbeat and welcome message
+            connected_at = datetime.utcnow()
+            
             # Initialize connection metadata
             self.connection_metadata[websocket] = {
                 "symbol": symbol,
-                "connected_at": datetime.utcnow(),
+                "connected_at": connected_at,
                 "ip_address": websocket.client.host if websocket.client else None,
                 "user_agent": websocket.headers.get("user-agent"),
-                "subscriptions": set()
+                "subscriptions": set(),
+                "batch": batch
             }
             
             # Initialize subscriptions
@@ -84,16 +91,16 @@ class ConnectionManager:
                 self.message_queues[symbol] = asyncio.Queue(maxsize=ws_settings.MESSAGE_QUEUE_SIZE)
             
             # Set last heartbeat
-            self.last_heartbeat[websocket] = datetime.utcnow()
+            self.last_heartbeat[websocket] = connected_at
             
-            logger.info(f"WebSocket connected for {symbol}: {websocket.client.host if websocket.client else 'unknown'}")
+            logger.info("WebSocket connected for %s: %s", symbol, websocket.client.host if websocket.client else 'unknown')
             
             # Send welcome message
             await self.send_personal_message(websocket, {
                 "type": "connection",
                 "status": "connected",
                 "symbol": symbol,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": connected_at,
                 "connection_id": id(websocket)
             })
             
@@ -113,9 +120,14 @@ class ConnectionManager:
             if symbol in self.active_connections:
                 self.active_connections[symbol].discard(websocket)
                 
-                # Clean up empty symbol sets
+                # Clean up empty symbol sets, along with the symbol's market
+                # data queue and sender
                 if not self.active_connections[symbol]:
                     del self.active_connections[symbol]
+                    self.message_queues.pop(symbol, None)
+                    sender = self.sender_tasks.pop(symbol, None)
+                    if sender is not None:
+                        sender.cancel()
             
             # Clean up metadata
             if websocket in self.connection_metadata:
@@ -125,10 +137,13 @@ class ConnectionManager:
             if websocket in self.subscriptions:
                 del self.subscriptions[websocket]
             
+            # Stop heartbeating this connection
+            self.last_heartbeat.pop(websocket, None)
+            
             # Update connection count
             self.connection_count = max(0, self.connection_count - 1)
             
-            logger.info(f"WebSocket disconnected for {symbol}: {websocket.client.host if websocket.client else 'unknown'}")
+            logger.info("WebSocket disconnected for %s: %s", symbol, websocket.client.host if websocket.client else 'unknown')
             
             return True
             
@@ -151,7 +166,7 @@ class ConnectionManager:
             if websocket in self.connection_metadata:
                 self.connection_metadata[websocket]["subscriptions"].add(subscription_key)
             
-            logger.info(f"WebSocket subscribed to {subscription_type} for {symbol}")
+            logger.info("WebSocket subscribed to %s for %s", subscription_type, symbol)
             
             # Send confirmation
             await self.send_personal_message(websocket, {
@@ -159,7 +174,7 @@ class ConnectionManager:
                 "status": "subscribed",
                 "symbol": symbol,
                 "subscription_type": subscription_type,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow(),
                 "connection_id": id(websocket)
             })
             
@@ -184,7 +199,7 @@ class ConnectionManager:
             if websocket in self.connection_metadata:
                 self.connection_metadata[websocket]["subscriptions"].discard(subscription_key)
             
-            logger.info(f"WebSocket unsubscribed from {subscription_type} for {symbol}")
+            logger.info("WebSocket unsubscribed from %s for %s", subscription_type, symbol)
             
             # Send confirmation
             await self.send_personal_message(websocket, {
@@ -192,7 +207,7 @@ class ConnectionManager:
                 "status": "unsubscribed",
                 "symbol": symbol,
                 "subscription_type": subscription_type,
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": datetime.utcnow(),
                 "connection_id": id(websocket)
             })
             
@@ -207,7 +222,7 @@ class ConnectionManager:
         Send a message to a specific WebSocket connection
         """
         try:
-            await websocket.send_text(json.dumps(message))
+            await websocket.send_text(orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode())
             self.message_count += 1
         except Exception as e:
             logger.error(f"Error sending personal message: {e}")
@@ -217,22 +232,37 @@ class ConnectionManager:
         """
         Broadcast a message to all connections for a specific symbol
         """
+        if symbol not in self.active_connections:
+            return
+        
+        await self._send_to_connections(symbol, list(self.active_connections[symbol]), message)
+    
+    async def _send_to_connections(self, symbol: str, connections: List[WebSocket], message: dict):
+        """
+        Send a message to the given connections for a symbol
+        """
         try:
-            if symbol not in self.active_connections:
-                return
+            # Send to all connections concurrently so one slow client
+            # does not delay delivery to the others
+            # Encode once and reuse the same payload for every connection
+            payload = orjson.dumps(message, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+            results = await asyncio.gather(
+                *(connection.send_text(payload) for connection in connections),
+                return_exceptions=True
+            )
             
             disconnected = set()
-            for connection in self.active_connections[symbol].copy():
-                try:
-                    await connection.send_text(json.dumps(message))
-                    self.message_count += 1
-                except Exception as e:
-                    logger.error(f"Error broadcasting to {symbol}: {e}")
+            for connection, result in zip(connections, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error broadcasting to {symbol}: {result}")
                     disconnected.add(connection)
                     self.error_count += 1
+                else:
+                    self.message_count += 1
             
             # Remove disconnected connections
-            self.active_connections[symbol] -= disconnected
+            if symbol in self.active_connections:
+                self.active_connections[symbol] -= disconnected
             
         except Exception as e:
             logger.error(f"Error broadcasting to {symbol}: {e}")
@@ -243,17 +273,11 @@ class ConnectionManager:
         Broadcast a message to all active connections
         """
         try:
-            for symbol, connections in self.active_connections.items():
-                for connection in connections.copy():
-                    try:
-                        await connection.send_text(json.dumps({
-                            **message,
-                            "symbol": symbol
-                        }))
-                        self.message_count += 1
-                    except Exception as e:
-                        logger.error(f"Error broadcasting to {symbol}: {e}")
-                        self.error_count += 1
+            # Fan out to every symbol at once; each broadcast handles its own failures
+            await asyncio.gather(*(
+                self.broadcast_to_symbol(symbol, {**message, "symbol": symbol})
+                for symbol in list(self.active_connections)
+            ))
         except Exception as e:
             logger.error(f"Error broadcasting to all: {e}")
             self.error_count += 1
@@ -262,13 +286,25 @@ class ConnectionManager:
         """
         Send market data to subscribed connections
         """
-        message = {
-            "type": "market_data",
-            "symbol": symbol,
-            "data": data,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-        await self.broadcast_to_symbol(symbol, message)
+        queue = self.message_queues.get(symbol)
+        if queue is None or symbol not in self.active_connections:
+            # Nobody is connected for this symbol
+            return
+        
+        try:
+            queue.put_nowait({
+                "type": "market_data",
+                "symbol": symbol,
+                "data": data,
+                "timestamp": datetime.utcnow()
+            })
+        except asyncio.QueueFull:
+            logger.warning("Market data queue full for %s, dropping update", symbol)
+            self.error_count += 1
+            return
+        
+        if symbol not in self.sender_tasks:
+            self.sender_tasks[symbol] = asyncio.create_task(self._market_data_sender(symbol, queue))
     
     async def send_indicator_data(self, symbol: str, indicators: dict):
         """
@@ -278,7 +314,7 @@ class ConnectionManager:
             "type": "indicator_data",
             "symbol": symbol,
             "indicators": indicators,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         await self.broadcast_to_symbol(symbol, message)
     
@@ -290,7 +326,7 @@ class ConnectionManager:
             "type": "trade_update",
             "symbol": symbol,
             "trade": trade_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         await self.broadcast_to_symbol(symbol, message)
     
@@ -302,7 +338,7 @@ class ConnectionManager:
             "type": "strategy_signal",
             "symbol": symbol,
             "signal": signal_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         await self.broadcast_to_symbol(symbol, message)
     
@@ -314,7 +350,7 @@ class ConnectionManager:
             "type": "alert",
             "symbol": symbol,
             "alert": alert_data,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
         await self.broadcast_to_symbol(symbol, message)
     
@@ -323,22 +359,48 @@ class ConnectionManager:
         Send heartbeat to a specific connection
         """
         try:
+            sent_at = datetime.utcnow()
             message = {
                 "type": "heartbeat",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": sent_at
             }
-            await websocket.send_text(json.dumps(message))
-            self.last_heartbeat[websocket] = datetime.utcnow()
+            await websocket.send_text(orjson.dumps(message).decode())
+            self.last_heartbeat[websocket] = sent_at
         except Exception as e:
             logger.error(f"Error sending heartbeat: {e}")
             self.error_count += 1
     
+    async def send_heartbeats(self):
+        """
+        Send heartbeats to all connections concurrently
+        """
+        sent_at = datetime.utcnow()
+        payload = orjson.dumps({
+            "type": "heartbeat",
+            "timestamp": sent_at
+        }).decode()
+        
+        # Failures come back as results, so one dead client neither holds up
+        # the others nor costs a traceback; it simply stops getting its
+        # heartbeat refreshed and times out
+        websockets = list(self.last_heartbeat)
+        results = await asyncio.gather(
+            *(websocket.send_text(payload) for websocket in websockets),
+            return_exceptions=True
+        )
+        
+        for websocket, result in zip(websockets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Heartbeat failed for connection {id(websocket)}: {result}")
+                self.error_count += 1
+            elif websocket in self.last_heartbeat:
+                self.last_heartbeat[websocket] = sent_at
+    
     async def check_heartbeats(self):
         """
         Check all connections for heartbeat timeouts
         """
         try:
-            current_time = datetime.utcnow()
             timeout_threshold = datetime.utcnow() - timedelta(seconds=self.heartbeat_interval * 2)
             
             disconnected = set()
@@ -437,13 +499,19 @@ class ConnectionManager:
         Shutdown WebSocket manager
         """
         try:
-            # Close all active connections
-            for symbol, connections in self.active_connections.items():
-                for websocket in connections.copy():
-                    try:
-                        await websocket.close(code=1001, reason="Server shutdown")
-                    except Exception as e:
-                        logger.error(f"Error closing connection: {e}")
+            # Close all active connections concurrently
+            websockets = [
+                websocket
+                for connections in self.active_connections.values()
+                for websocket in connections
+            ]
+            results = await asyncio.gather(
+                *(websocket.close(code=1001, reason="Server shutdown") for websocket in websockets),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"Error closing connection: {result}")
             
             # Clear all data structures
             self.active_connections.clear()
@@ -452,6 +520,10 @@ class ConnectionManager:
             self.message_queues.clear()
             self.last_heartbeat.clear()
             
+            for task in self.sender_tasks.values():
+                task.cancel()
+            self.sender_tasks.clear()
+            
             logger.info("WebSocket manager shutdown successfully")
             return True
             
@@ -459,12 +531,50 @@ class ConnectionManager:
             logger.error(f"Error shutting down WebSocket manager: {e}")
             return False
     
+    async def _market_data_sender(self, symbol: str, queue: asyncio.Queue):
+        """
+        Background task that sends a symbol's queued market data, coalescing
+        a burst of updates into one batch message for connections that opted in
+        """
+        while True:
+            message = await queue.get()
+            
+            # Let the rest of a burst arrive, then take everything queued
+            await asyncio.sleep(ws_settings.BATCH_WINDOW)
+            batch = [message]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            
+            if len(batch) == 1:
+                await self.broadcast_to_symbol(symbol, message)
+                continue
+            
+            # Other connections keep getting one market_data message per update
+            batched, per_update = [], []
+            for connection in self.active_connections.get(symbol, ()):
+                if self.connection_metadata.get(connection, {}).get("batch"):
+                    batched.append(connection)
+                else:
+                    per_update.append(connection)
+            
+            if batched:
+                await self._send_to_connections(symbol, batched, {
+                    "type": "market_data_batch",
+                    "symbol": symbol,
+                    "messages": batch,
+                    "timestamp": datetime.utcnow()
+                })
+            if per_update:
+                for queued in batch:
+                    await self._send_to_connections(symbol, per_update, queued)
+    
     async def _heartbeat_loop(self):
         """
         Background task to check heartbeats
         """
         while True:
             await asyncio.sleep(self.heartbeat_interval)
+            await self.send_heartbeats()
             await self.check_heartbeats()
 
 
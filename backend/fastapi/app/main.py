@@ -3,22 +3,28 @@ VELOX-N8N FastAPI Main Application
 Algorithmic Trading System with Real-time Indicators and N8N Integration
 """
 
-from fastapi import FastAPI, Request, HTTPException
+from fastapi import FastAPI, Request, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 import logging
 import time
 import os
+import asyncio
+import orjson
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.core.database import engine, Base
 from app.core.logging import setup_logging
+from app.core.security import pwd_context
 from app.api import auth, trading, strategies, indicators, market_data, risk, webhooks
 from app.core.websocket_manager import manager
+from app.services.trading_service import MarketDataService
+from app.services.strategy_service import warm_backtest_series
 
 # Setup logging
 setup_logging()
@@ -37,6 +43,16 @@ async def lifespan(app: FastAPI):
     # Initialize WebSocket manager
     await manager.startup()
     
+    # Market data service is shared by every request for the life of the app
+    app.state.market_data_service = MarketDataService()
+    await app.state.market_data_service.startup()
+    
+    # Load the bcrypt backend now so the first login doesn't pay for it
+    await asyncio.to_thread(pwd_context.dummy_verify)
+    
+    # Likewise for the numpy kernels behind backtest results
+    await asyncio.to_thread(warm_backtest_series)
+    
     logger.info("Application startup completed")
     
     yield
@@ -44,6 +60,7 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down VELOX-N8N FastAPI application...")
     await manager.shutdown()
+    await app.state.market_data_service.shutdown()
     logger.info("Application shutdown completed")
 
 # Create FastAPI application
@@ -53,6 +70,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs" if settings.ENVIRONMENT == "development" else None,
     redoc_url="/redoc" if settings.ENVIRONMENT == "development" else None,
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -71,6 +89,12 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# Compress larger responses (backtests, order and history lists) for clients that accept gzip
+app.add_middleware(
+    GZipMiddleware,
+    minimum_size=4096
+)
+
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
@@ -81,17 +105,20 @@ async def add_process_time_header(request: Request, call_next):
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
+# Security headers added to every response
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Referrer-Policy": "strict-origin-when-cross-origin"
+}
+
 # Security headers middleware
 @app.middleware("http")
 async def add_security_headers(request: Request, call_next):
     """Add security headers to responses"""
     response = await call_next(request)
-    
-    response.headers["X-Content-Type-Options"] = "nosniff"
-    response.headers["X-Frame-Options"] = "DENY"
-    response.headers["X-XSS-Protection"] = "1; mode=block"
-    response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-    
+    response.headers.update(SECURITY_HEADERS)
     return response
 
 # Rate limiting middleware (basic implementation)
@@ -99,8 +126,9 @@ async def add_security_headers(request: Request, call_next):
 async def rate_limit_middleware(request: Request, call_next):
     """Basic rate limiting implementation"""
     # This is a simplified version - in production, use Redis-based rate limiting
-    client_ip = request.client.host
-    logger.debug(f"Request from {client_ip} to {request.url.path}")
+    # Building request.url is not free, so only do it when debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Request from %s to %s", request.client.host, request.url.path)
     
     response = await call_next(request)
     return response
@@ -150,13 +178,17 @@ app.include_router(
 
 # WebSocket endpoint
 @app.websocket("/ws/{symbol}")
-async def websocket_endpoint(websocket, symbol: str):
+async def websocket_endpoint(websocket, symbol: str, batch: bool = False):
     """WebSocket endpoint for real-time data streaming"""
-    await manager.connect(websocket, symbol)
+    await manager.connect(websocket, symbol, batch)
     try:
         while True:
-            # Keep connection alive
-            await websocket.receive_text()
+            # Keep connection alive; client frames are only drained, so take
+            # the raw ASGI message instead of decoding text or parsing JSON,
+            # which also tolerates binary frames
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
     except Exception as e:
         logger.error(f"WebSocket error for {symbol}: {e}")
     finally:
@@ -200,25 +232,28 @@ async def detailed_health_check():
         }
     }
 
+# Root endpoint payload never changes for the life of the process
+ROOT_INFO = orjson.dumps({
+    "name": "VELOX-N8N Trading API",
+    "version": "1.0.0",
+    "description": "Algorithmic Trading System with Real-time Indicators and N8N Integration",
+    "docs_url": "/docs" if settings.ENVIRONMENT == "development" else None,
+    "health_url": "/health",
+    "environment": settings.ENVIRONMENT
+})
+
 # Root endpoint
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
-    return {
-        "name": "VELOX-N8N Trading API",
-        "version": "1.0.0",
-        "description": "Algorithmic Trading System with Real-time Indicators and N8N Integration",
-        "docs_url": "/docs" if settings.ENVIRONMENT == "development" else None,
-        "health_url": "/health",
-        "environment": settings.ENVIRONMENT
-    }
+    return Response(content=ROOT_INFO, media_type="application/json")
 
 # Global exception handlers
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Global HTTP exception handler"""
     logger.warning(f"HTTP exception: {exc.status_code} - {exc.detail}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": True,
@@ -232,7 +267,7 @@ async def http_exception_handler(request: Request, exc: HTTPException):
 async def general_exception_handler(request: Request, exc: Exception):
     """Global exception handler"""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": True,
@@ -252,6 +287,8 @@ if __name__ == "__main__":
         host=settings.API_HOST,
         port=settings.API_PORT,
         reload=settings.HOT_RELOAD,
+        loop="uvloop",
+        http="httptools",
         log_level=settings.LOG_LEVEL.lower(),
         access_log=True,
         use_colors=True
@@ -3,6 +3,7 @@ VELOX-N8N Database Models
 Package initialization for all database models
 """
 
+from app.core.database import Base
 from app.models.user import User
 from app.models.strategy import Strategy, StrategyPerformance
 from app.models.trade import Trade, Position, OrderType, OrderSide, TradeStatus, PositionType
@@ -62,7 +63,6 @@ __all__ = [
 # Model metadata for Alembic
 def get_model_metadata():
     """Get all model metadata for migrations"""
-    from app.core.database import Base
     return Base.metadata
 
 # Model registry for dynamic operations
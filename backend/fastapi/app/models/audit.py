@@ -80,6 +80,12 @@ class AuditSeverity(str, enum.Enum):
     INFO = "INFO"
 
 
+# Severity, level and status groups, hashed once for O(1) membership checks
+HIGH_AUDIT_SEVERITIES = frozenset({AuditSeverity.CRITICAL.value, AuditSeverity.HIGH.value})
+ERROR_LOG_LEVELS = frozenset({'ERROR', 'CRITICAL'})
+PENDING_REPORT_STATUSES = frozenset({'PENDING', 'GENERATING'})
+
+
 class AuditLog(Base):
     """
     Audit log model for tracking all system events
@@ -164,7 +170,7 @@ class AuditLog(Base):
     @property
     def is_high_severity(self) -> bool:
         """Check if event is high severity"""
-        return self.severity in [AuditSeverity.CRITICAL.value, AuditSeverity.HIGH.value]
+        return self.severity in HIGH_AUDIT_SEVERITIES
     
     @property
     def is_security_event(self) -> bool:
@@ -375,7 +381,7 @@ class SystemLog(Base):
     @property
     def is_error(self) -> bool:
         """Check if log is error level"""
-        return self.level in ['ERROR', 'CRITICAL']
+        return self.level in ERROR_LOG_LEVELS
     
     @property
     def is_warning(self) -> bool:
@@ -500,7 +506,7 @@ class ComplianceReport(Base):
     @property
     def is_pending(self) -> bool:
         """Check if report is pending"""
-        return self.status in ['PENDING', 'GENERATING']
+        return self.status in PENDING_REPORT_STATUSES
     
     @property
     def is_failed(self) -> bool:
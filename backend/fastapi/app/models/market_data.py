@@ -48,6 +48,10 @@ class MarketDataType(str, enum.Enum):
     FUNDAMENTAL = "FUNDAMENTAL"
 
 
+# Instrument types traded as derivatives, hashed once for O(1) membership checks
+DERIVATIVE_INSTRUMENT_TYPES = frozenset({'FUTURES', 'OPTIONS'})
+
+
 class Symbol(Base):
     """
     Symbol model for instrument information
@@ -114,7 +118,7 @@ class Symbol(Base):
     @property
     def is_derivative(self) -> bool:
         """Check if symbol is derivative"""
-        return self.instrument_type.upper() in ['FUTURES', 'OPTIONS']
+        return self.instrument_type.upper() in DERIVATIVE_INSTRUMENT_TYPES
     
     def to_dict(self) -> dict:
         """Convert symbol to dictionary"""
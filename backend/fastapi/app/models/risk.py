@@ -35,6 +35,11 @@ class AlertType(str, enum.Enum):
     LEVERAGE = "LEVERAGE"
 
 
+# Level and status groups, hashed once for O(1) membership checks
+HIGH_RISK_LEVELS = frozenset({RiskLevel.HIGH.value, RiskLevel.CRITICAL.value})
+ACKNOWLEDGED_ALERT_STATUSES = frozenset({'ACKNOWLEDGED', 'RESOLVED'})
+
+
 class RiskSettings(Base):
     """
     Risk settings model for user-specific risk management
@@ -290,7 +295,7 @@ class RiskAlert(Base):
     @property
     def is_acknowledged(self) -> bool:
         """Check if alert is acknowledged"""
-        return self.status in ['ACKNOWLEDGED', 'RESOLVED']
+        return self.status in ACKNOWLEDGED_ALERT_STATUSES
     
     @property
     def is_resolved(self) -> bool:
@@ -500,7 +505,7 @@ class RiskMetrics(Base):
     @property
     def is_high_risk(self) -> bool:
         """Check if risk level is high"""
-        return self.risk_level in [RiskLevel.HIGH.value, RiskLevel.CRITICAL.value]
+        return self.risk_level in HIGH_RISK_LEVELS
     
     @property
     def is_low_risk(self) -> bool:
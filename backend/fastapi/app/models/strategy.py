@@ -8,12 +8,40 @@ from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
+from types import MappingProxyType
 import uuid
 import json
 
 from app.core.database import Base
 
 
+# Display names, built once and shared read-only by every instance
+STRATEGY_STATUS_DISPLAY = MappingProxyType({
+    'draft': 'Draft',
+    'testing': 'Testing',
+    'active': 'Active',
+    'paused': 'Paused',
+    'archived': 'Archived'
+})
+
+STRATEGY_TYPE_DISPLAY = MappingProxyType({
+    'trend_following': 'Trend Following',
+    'mean_reversion': 'Mean Reversion',
+    'momentum': 'Momentum',
+    'arbitrage': 'Arbitrage',
+    'scalping': 'Scalping',
+    'swing': 'Swing Trading',
+    'position': 'Position Trading'
+})
+
+# Parameters each strategy type must define, looked up by type instead of branching
+STRATEGY_REQUIRED_PARAMS = MappingProxyType({
+    'trend_following': ('fast_period', 'slow_period', 'signal_period'),
+    'mean_reversion': ('period', 'std_dev'),
+    'momentum': ('rsi_period', 'rsi_overbought', 'rsi_oversold')
+})
+
+
 class Strategy(Base):
     """
     Strategy model for trading strategy configuration
@@ -85,28 +113,12 @@ class Strategy(Base):
     @property
     def display_status(self) -> str:
         """Get display status name"""
-        status_map = {
-            'draft': 'Draft',
-            'testing': 'Testing',
-            'active': 'Active',
-            'paused': 'Paused',
-            'archived': 'Archived'
-        }
-        return status_map.get(self.status, self.status.capitalize())
+        return STRATEGY_STATUS_DISPLAY.get(self.status, self.status.capitalize())
     
     @property
     def display_type(self) -> str:
         """Get display strategy type name"""
-        type_map = {
-            'trend_following': 'Trend Following',
-            'mean_reversion': 'Mean Reversion',
-            'momentum': 'Momentum',
-            'arbitrage': 'Arbitrage',
-            'scalping': 'Scalping',
-            'swing': 'Swing Trading',
-            'position': 'Position Trading'
-        }
-        return type_map.get(self.strategy_type, self.strategy_type.replace('_', ' ').title())
+        return STRATEGY_TYPE_DISPLAY.get(self.strategy_type, self.strategy_type.replace('_', ' ').title())
     
     def calculate_win_rate(self) -> float:
         """Calculate win rate percentage"""
@@ -202,23 +214,9 @@ class Strategy(Base):
             errors.append("At least one timeframe is required")
         
         # Strategy-specific validation
-        if self.strategy_type == 'trend_following':
-            required_params = ['fast_period', 'slow_period', 'signal_period']
-            for param in required_params:
-                if not self.parameters or param not in self.parameters:
-                    errors.append(f"Required parameter '{param}' missing for trend following strategy")
-        
-        elif self.strategy_type == 'mean_reversion':
-            required_params = ['period', 'std_dev']
-            for param in required_params:
-                if not self.parameters or param not in self.parameters:
-                    errors.append(f"Required parameter '{param}' missing for mean reversion strategy")
-        
-        elif self.strategy_type == 'momentum':
-            required_params = ['rsi_period', 'rsi_overbought', 'rsi_oversold']
-            for param in required_params:
-                if not self.parameters or param not in self.parameters:
-                    errors.append(f"Required parameter '{param}' missing for momentum strategy")
+        for param in STRATEGY_REQUIRED_PARAMS.get(self.strategy_type, ()):
+            if not self.parameters or param not in self.parameters:
+                errors.append(f"Required parameter '{param}' missing for {self.strategy_type.replace('_', ' ')} strategy")
         
         return len(errors) == 0, errors
     
@@ -8,6 +8,7 @@ from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
+from types import MappingProxyType
 import uuid
 import enum
 
@@ -56,6 +57,36 @@ class PositionType(str, enum.Enum):
     FLAT = "FLAT"
 
 
+# Display names, built once and shared read-only by every instance
+TRADE_STATUS_DISPLAY = MappingProxyType({
+    'PENDING': 'Pending',
+    'PLACED': 'Placed',
+    'PARTIALLY_FILLED': 'Partially Filled',
+    'FILLED': 'Filled',
+    'CANCELLED': 'Cancelled',
+    'REJECTED': 'Rejected',
+    'EXPIRED': 'Expired'
+})
+
+ORDER_TYPE_DISPLAY = MappingProxyType({
+    'MARKET': 'Market',
+    'LIMIT': 'Limit',
+    'STOP_LOSS': 'Stop Loss',
+    'STOP_MARKET': 'Stop Market',
+    'TAKE_PROFIT': 'Take Profit'
+})
+
+POSITION_TYPE_DISPLAY = MappingProxyType({
+    'LONG': 'Long',
+    'SHORT': 'Short',
+    'FLAT': 'Flat'
+})
+
+# Status and order type groups, hashed once for O(1) membership checks
+STOP_ORDER_TYPES = frozenset({OrderType.STOP_LOSS, OrderType.STOP_MARKET})
+PENDING_TRADE_STATUSES = frozenset({TradeStatus.PENDING, TradeStatus.PARTIALLY_EXECUTED})
+
+
 class Trade(Base):
     """
     Trade model for order execution tracking
@@ -153,7 +184,7 @@ class Trade(Base):
     @property
     def is_stop_order(self) -> bool:
         """Check if trade is a stop order"""
-        return self.order_type in [OrderType.STOP_LOSS, OrderType.STOP_MARKET]
+        return self.order_type in STOP_ORDER_TYPES
     
     @property
     def is_executed(self) -> bool:
@@ -163,7 +194,7 @@ class Trade(Base):
     @property
     def is_pending(self) -> bool:
         """Check if trade is pending"""
-        return self.status in [TradeStatus.PENDING, TradeStatus.PLACED, TradeStatus.PARTIALLY_EXECUTED]
+        return self.status in PENDING_TRADE_STATUSES
     
     @property
     def is_cancelled(self) -> bool:
@@ -185,16 +216,7 @@ class Trade(Base):
     @property
     def display_status(self) -> str:
         """Get display status name"""
-        status_map = {
-            'PENDING': 'Pending',
-            'PLACED': 'Placed',
-            'PARTIALLY_FILLED': 'Partially Filled',
-            'FILLED': 'Filled',
-            'CANCELLED': 'Cancelled',
-            'REJECTED': 'Rejected',
-            'EXPIRED': 'Expired'
-        }
-        return status_map.get(self.status.value, self.status.value)
+        return TRADE_STATUS_DISPLAY.get(self.status.value, self.status.value)
     
     @property
     def display_side(self) -> str:
@@ -204,14 +226,7 @@ class Trade(Base):
     @property
     def display_type(self) -> str:
         """Get display order type name"""
-        type_map = {
-            'MARKET': 'Market',
-            'LIMIT': 'Limit',
-            'STOP_LOSS': 'Stop Loss',
-            'STOP_MARKET': 'Stop Market',
-            'TAKE_PROFIT': 'Take Profit'
-        }
-        return type_map.get(self.order_type.value, self.order_type.value)
+        return ORDER_TYPE_DISPLAY.get(self.order_type.value, self.order_type.value)
     
     def calculate_charges(self) -> float:
         """Calculate total charges"""
@@ -229,25 +244,22 @@ class Trade(Base):
         self.average_price = avg_price
         self.execution_price = execution_price or avg_price
         self.executed_value = filled_qty * avg_price
-        self.executed_at = datetime.utcnow()
+        self.executed_at = self.updated_at = datetime.utcnow()
         
         # Update status based on fill
         if filled_qty >= self.quantity:
             self.status = TradeStatus.EXECUTED
         elif filled_qty > 0:
             self.status = TradeStatus.PARTIALLY_EXECUTED
-        
-        self.updated_at = datetime.utcnow()
     
     def cancel(self, reason: str = None):
         """Cancel the trade"""
         self.status = TradeStatus.CANCELLED
-        self.cancelled_at = datetime.utcnow()
+        self.cancelled_at = self.updated_at = datetime.utcnow()
         if reason:
             if not self.notes:
                 self.notes = ""
             self.notes += f"\nCancelled: {reason}"
-        self.updated_at = datetime.utcnow()
     
     def to_dict(self, include_details: bool = True) -> dict:
         """Convert trade to dictionary"""
@@ -411,12 +423,7 @@ class Position(Base):
     @property
     def display_type(self) -> str:
         """Get display position type name"""
-        type_map = {
-            'LONG': 'Long',
-            'SHORT': 'Short',
-            'FLAT': 'Flat'
-        }
-        return type_map.get(self.position_type.value, self.position_type.value)
+        return POSITION_TYPE_DISPLAY.get(self.position_type.value, self.position_type.value)
     
     @property
     def days_open(self) -> int:
@@ -435,21 +442,31 @@ class Position(Base):
     
     def update_current_price(self, price: float):
         """Update current price and recalculate P&L"""
+        # Called for every open position on each tick, so read each
+        # instrumented column once into locals
+        quantity = self.quantity
+        position_type = self.position_type
+        investment_value = self.investment_value
+        unrealized_pnl = self.unrealized_pnl
+        now = datetime.utcnow()
+        
         self.last_price = self.current_price
         self.current_price = price
-        self.current_value = abs(self.quantity) * price
-        self.last_updated_at = datetime.utcnow()
+        self.current_value = abs(quantity) * price
+        self.last_updated_at = now
         
         # Recalculate unrealized P&L
-        if self.is_long:
-            self.unrealized_pnl = (price - self.average_buy_price) * self.quantity
-        elif self.is_short:
-            self.unrealized_pnl = (self.average_sell_price - price) * abs(self.quantity)
+        if position_type == PositionType.LONG:
+            unrealized_pnl = (price - self.average_buy_price) * quantity
+        elif position_type == PositionType.SHORT:
+            unrealized_pnl = (self.average_sell_price - price) * abs(quantity)
         
-        self.total_pnl = self.realized_pnl + self.unrealized_pnl
-        self.pnl_percentage = self.calculate_pnl_percentage()
+        total_pnl = self.realized_pnl + unrealized_pnl
+        self.unrealized_pnl = unrealized_pnl
+        self.total_pnl = total_pnl
+        self.pnl_percentage = (total_pnl / investment_value) * 100 if investment_value != 0 else 0.0
         
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now
     
     def add_trade(self, trade: Trade):
         """Add trade to position"""
@@ -516,14 +533,12 @@ class Position(Base):
         self.available_quantity = 0
         self.position_type = PositionType.FLAT
         self.status = 'CLOSED'
-        self.closed_at = datetime.utcnow()
+        self.closed_at = self.updated_at = datetime.utcnow()
         self.current_price = closing_price
         self.current_value = 0
         self.unrealized_pnl = 0
         self.total_pnl = self.realized_pnl
         self.pnl_percentage = self.calculate_pnl_percentage()
-        
-        self.updated_at = datetime.utcnow()
     
     def to_dict(self, include_details: bool = True) -> dict:
         """Convert position to dictionary"""
@@ -7,7 +7,8 @@ from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, Float
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from datetime import datetime
+from datetime import datetime, timedelta
+import secrets
 import uuid
 
 from app.core.database import Base
@@ -162,13 +163,12 @@ class User(Base):
     
     def update_login_info(self, ip_address: str = None, user_agent: str = None):
         """Update user login information"""
-        self.last_login = datetime.utcnow()
+        self.last_login = self.updated_at = datetime.utcnow()
         self.login_count += 1
         self.failed_login_attempts = 0
         self.locked_until = None
         self.last_ip_address = ip_address
         self.last_user_agent = user_agent
-        self.updated_at = datetime.utcnow()
     
     def increment_failed_login(self):
         """Increment failed login attempts"""
@@ -200,7 +200,6 @@ class User(Base):
     
     def generate_api_key(self) -> str:
         """Generate new API key"""
-        import secrets
         self.api_key = secrets.token_urlsafe(32)
         self.api_key_expires = datetime.utcnow() + timedelta(days=30)
         self.updated_at = datetime.utcnow()
@@ -214,7 +213,6 @@ class User(Base):
     
     def generate_session_token(self) -> str:
         """Generate new session token"""
-        import secrets
         self.session_token = secrets.token_urlsafe(32)
         self.session_expires = datetime.utcnow() + timedelta(hours=24)
         self.updated_at = datetime.utcnow()
@@ -228,7 +226,6 @@ class User(Base):
     
     def enable_two_factor(self) -> str:
         """Enable two-factor authentication"""
-        import secrets
         self.two_factor_secret = secrets.token_urlsafe(16)
         self.two_factor_enabled = True
         self.updated_at = datetime.utcnow()
@@ -244,6 +241,5 @@ class User(Base):
         """Verify two-factor authentication code"""
         # This is a simplified implementation
         # In a real system, you would use TOTP
-        import secrets
         expected_code = secrets.token_hex(3)[:6].upper()
         return code.upper() == expected_code
\ No newline at end of file
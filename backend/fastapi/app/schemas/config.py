@@ -7,6 +7,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
+import re
 
 
 class ConfigType(str, Enum):
@@ -40,6 +41,23 @@ class ConfigFormat(str, Enum):
     ENV = "env"
 
 
+class MergeStrategy(str, Enum):
+    """Configuration merge strategy enumeration"""
+    REPLACE = "replace"
+    MERGE = "merge"
+
+
+# Python types accepted for each config value type, with the name used in errors;
+# looked up once per value instead of walking a chain of string comparisons
+_VALUE_TYPES = {
+    'string': (str, 'a string'),
+    'number': ((int, float), 'a number'),
+    'boolean': (bool, 'a boolean'),
+    'array': (list, 'an array'),
+    'object': (dict, 'an object')
+}
+
+
 class ConfigCategory(BaseModel):
     """Configuration category schema"""
     name: str = Field(..., description="Category name")
@@ -73,21 +91,9 @@ class ConfigItem(BaseModel):
         validation_rules = values.get('validation')
         
         # Type validation
-        if value_type == 'string':
-            if not isinstance(v, str):
-                raise ValueError('Value must be a string')
-        elif value_type == 'number':
-            if not isinstance(v, (int, float)):
-                raise ValueError('Value must be a number')
-        elif value_type == 'boolean':
-            if not isinstance(v, bool):
-                raise ValueError('Value must be a boolean')
-        elif value_type == 'array':
-            if not isinstance(v, list):
-                raise ValueError('Value must be an array')
-        elif value_type == 'object':
-            if not isinstance(v, dict):
-                raise ValueError('Value must be an object')
+        expected = _VALUE_TYPES.get(value_type)
+        if expected is not None and not isinstance(v, expected[0]):
+            raise ValueError(f'Value must be {expected[1]}')
         
         # Custom validation rules
         if validation_rules:
@@ -100,7 +106,6 @@ class ConfigItem(BaseModel):
                     raise ValueError(f"Value must be at most {validation_rules['max']}")
             
             if 'pattern' in validation_rules and isinstance(v, str):
-                import re
                 pattern = validation_rules['pattern']
                 if not re.match(pattern, v):
                     raise ValueError(f"Value must match pattern {pattern}")
@@ -163,16 +168,9 @@ class ConfigImportRequest(BaseModel):
     """Configuration import request schema"""
     config_data: Dict[str, Any] = Field(..., description="Configuration data")
     scope: ConfigScope = Field(..., description="Configuration scope")
-    merge_strategy: str = Field("replace", description="Merge strategy (replace, merge)")
+    merge_strategy: MergeStrategy = Field(MergeStrategy.REPLACE, description="Merge strategy")
     user_id: Optional[int] = Field(None, description="User ID (for user scope)")
     strategy_id: Optional[int] = Field(None, description="Strategy ID (for strategy scope)")
-    
-    @validator('merge_strategy')
-    def validate_merge_strategy(cls, v):
-        """Validate merge strategy"""
-        if v not in ['replace', 'merge']:
-            raise ValueError('Merge strategy must be either "replace" or "merge"')
-        return v
 
 
 class ConfigBackupRequest(BaseModel):
@@ -207,14 +205,7 @@ class ConfigBackupResponse(BaseModel):
 class ConfigRestoreRequest(BaseModel):
     """Configuration restore request schema"""
     backup_id: int = Field(..., description="Backup ID")
-    merge_strategy: str = Field("replace", description="Merge strategy (replace, merge)")
-    
-    @validator('merge_strategy')
-    def validate_merge_strategy(cls, v):
-        """Validate merge strategy"""
-        if v not in ['replace', 'merge']:
-            raise ValueError('Merge strategy must be either "replace" or "merge"')
-        return v
+    merge_strategy: MergeStrategy = Field(MergeStrategy.REPLACE, description="Merge strategy")
 
 
 class ConfigValidationRequest(BaseModel):
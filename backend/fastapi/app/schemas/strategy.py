@@ -4,11 +4,16 @@ Pydantic models for strategy API validation and serialization
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
 
-from app.models.strategy import Strategy
+from app.models.strategy import Strategy, STRATEGY_REQUIRED_PARAMS
+
+
+def _unique(values: List[str]) -> List[str]:
+    """Drop repeated entries, keeping the first occurrence's position"""
+    return list(dict.fromkeys(values))
 
 
 class StrategyType(str, Enum):
@@ -37,6 +42,18 @@ class ExecutionMode(str, Enum):
     LIVE = "live"
 
 
+class SeriesLayout(str, Enum):
+    """Series layout enumeration"""
+    ROW = "row"
+    COLUMNAR = "columnar"
+
+
+class BacktestDetail(str, Enum):
+    """Backtest detail enumeration"""
+    FULL = "full"
+    SUMMARY = "summary"
+
+
 class StrategyCreate(BaseModel):
     """Strategy creation schema"""
     name: str = Field(..., min_length=3, max_length=100, description="Strategy name")
@@ -62,42 +79,21 @@ class StrategyCreate(BaseModel):
     n8n_workflow_id: Optional[str] = Field(None, max_length=100, description="N8N workflow ID")
     n8n_workflow_config: Optional[Dict[str, Any]] = Field(None, description="N8N workflow configuration")
     
-    @validator('symbols')
-    def validate_symbols(cls, v):
-        """Validate symbols list"""
-        if not v or len(v) == 0:
-            raise ValueError('At least one symbol is required')
-        return v
-    
-    @validator('timeframes')
-    def validate_timeframes(cls, v):
-        """Validate timeframes list"""
-        if not v or len(v) == 0:
-            raise ValueError('At least one timeframe is required')
-        return v
+    @validator('symbols', 'timeframes')
+    def validate_unique(cls, v):
+        """Drop repeated symbols and timeframes (min_items already rejects empty lists)"""
+        return _unique(v)
     
     @validator('config')
     def validate_config(cls, v, values):
         """Validate strategy configuration based on type"""
         strategy_type = values.get('strategy_type')
+        if not strategy_type:
+            return v
         
-        if strategy_type == StrategyType.TREND_FOLLOWING:
-            required_params = ['fast_period', 'slow_period', 'signal_period']
-            for param in required_params:
-                if param not in v:
-                    raise ValueError(f'Required parameter "{param}" missing for trend following strategy')
-        
-        elif strategy_type == StrategyType.MEAN_REVERSION:
-            required_params = ['period', 'std_dev']
-            for param in required_params:
-                if param not in v:
-                    raise ValueError(f'Required parameter "{param}" missing for mean reversion strategy')
-        
-        elif strategy_type == StrategyType.MOMENTUM:
-            required_params = ['rsi_period', 'rsi_overbought', 'rsi_oversold']
-            for param in required_params:
-                if param not in v:
-                    raise ValueError(f'Required parameter "{param}" missing for momentum strategy')
+        for param in STRATEGY_REQUIRED_PARAMS.get(strategy_type.value, ()):
+            if param not in v:
+                raise ValueError(f'Required parameter "{param}" missing for {strategy_type.value.replace("_", " ")} strategy')
         
         return v
 
@@ -117,6 +113,11 @@ class StrategyUpdate(BaseModel):
     execution_mode: Optional[ExecutionMode] = Field(None, description="Execution mode")
     n8n_workflow_id: Optional[str] = Field(None, max_length=100, description="N8N workflow ID")
     n8n_workflow_config: Optional[Dict[str, Any]] = Field(None, description="N8N workflow configuration")
+    
+    @validator('symbols', 'timeframes')
+    def validate_unique(cls, v):
+        """Drop repeated symbols and timeframes"""
+        return _unique(v) if v else v
 
 
 class StrategyResponse(BaseModel):
@@ -192,6 +193,13 @@ class StrategyBacktestRequest(BaseModel):
     symbols: Optional[List[str]] = Field(None, description="Override symbols for backtest")
     timeframes: Optional[List[str]] = Field(None, description="Override timeframes for backtest")
     parameters: Optional[Dict[str, Any]] = Field(None, description="Override parameters for backtest")
+    layout: SeriesLayout = Field(SeriesLayout.ROW, description="Layout of equity curve and trade history (row with ISO dates, or columnar with epoch-millisecond timestamps)")
+    detail: BacktestDetail = Field(BacktestDetail.FULL, description="Response detail (full, or summary without equity curve and trade history)")
+    
+    @validator('symbols', 'timeframes')
+    def validate_unique(cls, v):
+        """Drop repeated symbols and timeframes"""
+        return _unique(v) if v else v
     
     @validator('end_date')
     def validate_end_date(cls, v, values):
@@ -230,8 +238,8 @@ class StrategyBacktestResponse(BaseModel):
     commission_paid: float
     slippage_cost: float
     net_profit: float
-    equity_curve: List[Dict[str, Any]]
-    trade_history: List[Dict[str, Any]]
+    equity_curve: Union[List[Dict[str, Any]], Dict[str, List[Any]]]
+    trade_history: Union[List[Dict[str, Any]], Dict[str, List[Any]]]
     performance_metrics: Dict[str, Any]
     created_at: datetime
     completed_at: Optional[datetime]
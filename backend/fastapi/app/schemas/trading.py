@@ -3,12 +3,12 @@ VELOX-N8N Trading Schemas
 Pydantic models for trading API validation and serialization
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, root_validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
 
-from app.models.trade import OrderType, OrderSide, TradeStatus, PositionType
+from app.models.trade import OrderType, OrderSide, TradeStatus, PositionType, STOP_ORDER_TYPES
 
 
 class OrderCreate(BaseModel):
@@ -32,51 +32,41 @@ class OrderCreate(BaseModel):
     tags: Optional[List[str]] = Field(None, description="Order tags")
     notes: Optional[str] = Field(None, max_length=500, description="Order notes")
     
-    @validator('price')
-    def validate_price(cls, v, values):
-        """Validate price based on order type"""
-        order_type = values.get('order_type')
-        if order_type == OrderType.MARKET and v is not None:
+    @root_validator(skip_on_failure=True)
+    def validate_order_prices(cls, values):
+        """Validate price, trigger price and risk prices against order type and side"""
+        order_type = values['order_type']
+        order_side = values['order_side']
+        price = values.get('price')
+        stop_loss = values.get('stop_loss')
+        take_profit = values.get('take_profit')
+        
+        if order_type == OrderType.MARKET and price is not None:
             raise ValueError('Market orders cannot have a price')
-        elif order_type in [OrderType.LIMIT, OrderType.TAKE_PROFIT] and v is None:
+        elif order_type in (OrderType.LIMIT, OrderType.TAKE_PROFIT) and price is None:
             raise ValueError('Limit orders must have a price')
-        return v
-    
-    @validator('trigger_price')
-    def validate_trigger_price(cls, v, values):
-        """Validate trigger price for stop orders"""
-        order_type = values.get('order_type')
-        if order_type in [OrderType.STOP_LOSS, OrderType.STOP_MARKET] and v is None:
+        
+        is_stop_order = order_type in STOP_ORDER_TYPES
+        if is_stop_order and values.get('trigger_price') is None:
             raise ValueError('Stop orders must have a trigger price')
-        elif order_type not in [OrderType.STOP_LOSS, OrderType.STOP_MARKET] and v is not None:
+        elif not is_stop_order and values.get('trigger_price') is not None:
             raise ValueError('Only stop orders can have a trigger price')
-        return v
-    
-    @validator('stop_loss', 'take_profit')
-    def validate_risk_prices(cls, v, values):
-        """Validate stop loss and take profit prices"""
-        order_side = values.get('order_side')
-        price = values.get('price')
         
-        if v is None:
-            return v
+        if price:
+            if order_side == OrderSide.BUY:
+                # For buy orders, stop loss should be below price and take profit above
+                if stop_loss is not None and stop_loss >= price:
+                    raise ValueError('Stop loss must be below order price for buy orders')
+                if take_profit is not None and take_profit <= price:
+                    raise ValueError('Take profit must be above order price for buy orders')
+            elif order_side == OrderSide.SELL:
+                # For sell orders, stop loss should be above price and take profit below
+                if stop_loss is not None and stop_loss <= price:
+                    raise ValueError('Stop loss must be above order price for sell orders')
+                if take_profit is not None and take_profit >= price:
+                    raise ValueError('Take profit must be below order price for sell orders')
         
-        if order_side == OrderSide.BUY:
-            # For buy orders, stop loss should be below price
-            if price and v >= price:
-                raise ValueError('Stop loss must be below order price for buy orders')
-            # Take profit should be above price
-            if price and v <= price:
-                raise ValueError('Take profit must be above order price for buy orders')
-        elif order_side == OrderSide.SELL:
-            # For sell orders, stop loss should be above price
-            if price and v <= price:
-                raise ValueError('Stop loss must be above order price for sell orders')
-            # Take profit should be below price
-            if price and v >= price:
-                raise ValueError('Take profit must be below order price for sell orders')
-        
-        return v
+        return values
 
 
 class OrderUpdate(BaseModel):
@@ -260,13 +250,6 @@ class OrderBookRequest(BaseModel):
     symbol: str = Field(..., description="Trading symbol")
     exchange: str = Field(..., description="Exchange name")
     depth: int = Field(5, ge=1, le=20, description="Order book depth")
-    
-    @validator('depth')
-    def validate_depth(cls, v):
-        """Validate depth is reasonable"""
-        if v < 1 or v > 20:
-            raise ValueError('Depth must be between 1 and 20')
-        return v
 
 
 class OrderBookLevel(BaseModel):
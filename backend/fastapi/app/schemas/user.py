@@ -30,16 +30,6 @@ class UserCreate(UserBase):
     last_name: Optional[str] = Field(None, max_length=50, description="Last name")
     phone_number: Optional[str] = Field(None, max_length=20, description="Phone number")
     
-    @validator('password')
-    def validate_password(cls, v):
-        """Validate password strength"""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
-        if len(v) > 128:
-            raise ValueError('Password must not be more than 128 characters long')
-        # Add more password validation as needed
-        return v
-    
     @validator('phone_number')
     def validate_phone_number(cls, v):
         """Validate phone number format"""
@@ -96,15 +86,6 @@ class UserChangePassword(BaseModel):
     """User password change schema"""
     current_password: str = Field(..., description="Current password")
     new_password: str = Field(..., min_length=8, max_length=128, description="New password")
-    
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        """Validate new password strength"""
-        if len(v) < 8:
-            raise ValueError('New password must be at least 8 characters long')
-        if len(v) > 128:
-            raise ValueError('New password must not be more than 128 characters long')
-        return v
 
 
 class UserForgotPassword(BaseModel):
@@ -116,15 +97,6 @@ class UserResetPassword(BaseModel):
     """User reset password schema"""
     token: str = Field(..., description="Reset token")
     new_password: str = Field(..., min_length=8, max_length=128, description="New password")
-    
-    @validator('new_password')
-    def validate_new_password(cls, v):
-        """Validate new password strength"""
-        if len(v) < 8:
-            raise ValueError('New password must be at least 8 characters long')
-        if len(v) > 128:
-            raise ValueError('New password must not be more than 128 characters long')
-        return v
 
 
 class Token(BaseModel):
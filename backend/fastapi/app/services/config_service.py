@@ -13,6 +13,8 @@ import uuid
 import json
 import os
 import yaml
+from functools import lru_cache
+from operator import attrgetter
 
 from app.core.database import get_db
 from app.models.user import User
@@ -30,18 +32,30 @@ from app.core.security import generate_api_key
 
 logger = logging.getLogger(__name__)
 
+CONFIG_DIR = "/app/config"
+BACKUP_DIR = "/app/backups"
+
+# Sort key for listed configs, resolved in C rather than through a lambda
+CONFIG_ORDER_KEY = attrgetter("order")
+
+
+@lru_cache(maxsize=1)
+def _ensure_config_dirs():
+    """Create the config and backup directories once per process"""
+    os.makedirs(CONFIG_DIR, exist_ok=True)
+    os.makedirs(BACKUP_DIR, exist_ok=True)
+
 
 class ConfigurationService:
     """Service for configuration management operations"""
     
     def __init__(self, db: Session):
         self.db = db
-        self.config_dir = "/app/config"
-        self.backup_dir = "/app/backups"
+        self.config_dir = CONFIG_DIR
+        self.backup_dir = BACKUP_DIR
         
         # Ensure directories exist
-        os.makedirs(self.config_dir, exist_ok=True)
-        os.makedirs(self.backup_dir, exist_ok=True)
+        _ensure_config_dirs()
     
     async def get_config(self, key: str, scope: ConfigScope, user_id: Optional[int] = None, 
                       strategy_id: Optional[int] = None) -> Optional[ConfigResponse]:
@@ -207,6 +221,10 @@ class ConfigurationService:
                 for key, value in config_data.items():
                     metadata = self._get_config_metadata(key, scope)
                     
+                    # Filter by category before building the response model
+                    if category and metadata.get('category', 'general') != category:
+                        continue
+                    
                     configs.append(ConfigResponse(
                         key=key,
                         value=value.get('value'),
@@ -226,12 +244,8 @@ class ConfigurationService:
                         updated_at=value.get('updated_at')
                     ))
             
-            # Filter by category if specified
-            if category:
-                configs = [c for c in configs if c.category == category]
-            
             # Sort by order
-            configs.sort(key=lambda c: c.order)
+            configs.sort(key=CONFIG_ORDER_KEY)
             
             return configs
             
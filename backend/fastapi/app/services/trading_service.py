@@ -5,11 +5,14 @@ Business logic for trading operations and order management
 
 from typing import Optional, List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, asc, func
-from datetime import datetime, timedelta
+from sqlalchemy import and_, or_, desc, asc, func, case
+from datetime import datetime, timedelta, timezone
+from operator import itemgetter
 import logging
 import uuid
 import asyncio
+import httpx
+import numpy as np
 
 from app.core.database import get_db
 from app.models.trade import Trade, Position, OrderType, OrderSide, TradeStatus, PositionType
@@ -23,9 +26,39 @@ from app.schemas.trading import (
 )
 from app.core.logging import log_trading_event, log_error
 from app.core.security import generate_api_key
+from app.core.cache import TTLCache
+from app.core.config import market_data_settings, trading_settings
 
 logger = logging.getLogger(__name__)
 
+# Market data is shared across users, so cache it per process
+market_data_cache = TTLCache(ttl=market_data_settings.CACHE_TTL)
+
+# Position columns summed into the portfolio summary, in unpacking order
+PORTFOLIO_NUMERIC_COLUMNS = (
+    Position.quantity,
+    Position.current_price,
+    Position.current_value,
+    Position.total_pnl,
+    Position.unrealized_pnl,
+    Position.realized_pnl,
+    Position.investment_value,
+    Position.max_drawdown
+)
+
+# Deepest order book a client can request; fetched once and sliced per request
+ORDER_BOOK_MAX_DEPTH = 20
+
+# Order book level quantity, read in C rather than through a generator expression
+LEVEL_QUANTITY = itemgetter("quantity")
+
+# Analytics for recently requested periods, keyed by (user_id, start_date, end_date)
+analytics_cache = TTLCache(ttl=trading_settings.ANALYTICS_CACHE_TTL)
+
+# Portfolio summaries keyed by user, day and a fingerprint of the open positions,
+# so an entry is only reused while none of its positions has changed
+portfolio_cache = TTLCache(max_size=256)
+
 
 class TradingService:
     """Service for trading operations"""
@@ -38,6 +71,7 @@ class TradingService:
         try:
             # Generate unique order ID
             order_id = f"ORD_{uuid.uuid4().hex[:12].upper()}"
+            now = datetime.utcnow()
             
             # Create trade record
             trade = Trade(
@@ -58,8 +92,8 @@ class TradingService:
                 status=TradeStatus.PENDING,
                 tags=order_data.tags,
                 notes=order_data.notes,
-                created_at=datetime.utcnow(),
-                placed_at=datetime.utcnow()
+                created_at=now,
+                placed_at=now
             )
             
             # Calculate order value
@@ -342,128 +376,118 @@ class TradingService:
     async def get_portfolio_summary(self, user_id: int) -> Optional[PortfolioSummary]:
         """Get portfolio summary"""
         try:
-            # Get all positions
-            positions = self.db.query(Position).filter(
+            # Every change to an open position bumps its updated_at, and opening or
+            # closing one changes the count, so the two identify the summary's inputs
+            position_count, last_update = self.db.query(
+                func.count(Position.id),
+                func.max(Position.updated_at)
+            ).filter(
                 and_(
                     Position.user_id == user_id,
                     Position.status == 'OPEN'
                 )
-            ).all()
-            
-            # Calculate portfolio metrics
-            total_value = sum(p.current_value or 0 for p in positions)
-            total_exposure = sum(abs(p.quantity) * (p.current_price or 0) for p in positions)
-            net_exposure = sum(p.quantity * (p.current_price or 0) for p in positions)
-            total_pnl = sum(p.total_pnl or 0 for p in positions)
-            unrealized_pnl = sum(p.unrealized_pnl or 0 for p in positions)
-            realized_pnl = sum(p.realized_pnl or 0 for p in positions)
-            
-            # Count positions
-            active_positions = len(positions)
-            long_positions = len([p for p in positions if p.is_long])
-            short_positions = len([p for p in positions if p.is_short])
-            
-            # Calculate max drawdown (simplified)
-            max_drawdown = max([p.max_drawdown or 0 for p in positions] + [0])
-            
-            # Calculate leverage ratio
-            investment_value = sum(p.investment_value or 0 for p in positions)
-            leverage_ratio = total_exposure / investment_value if investment_value > 0 else 1.0
-            
-            # Get user's cash balance (simplified - would come from account service)
-            available_cash = 100000.0  # Placeholder
-            used_margin = total_exposure * 0.5  # Placeholder
-            available_margin = available_cash - used_margin
-            margin_call_level = (used_margin / available_cash * 100) if available_cash > 0 else 0
-            
-            # Calculate daily P&L (simplified)
-            daily_pnl = sum(p.total_pnl or 0 for p in positions 
-                           if p.last_updated_at and p.last_updated_at.date() == datetime.utcnow().date())
-            
-            return PortfolioSummary(
-                total_value=total_value,
-                total_exposure=total_exposure,
-                net_exposure=net_exposure,
-                available_cash=available_cash,
-                used_margin=used_margin,
-                available_margin=available_margin,
-                margin_call_level=margin_call_level,
-                total_pnl=total_pnl,
-                daily_pnl=daily_pnl,
-                unrealized_pnl=unrealized_pnl,
-                realized_pnl=realized_pnl,
-                total_positions=active_positions,
-                active_positions=active_positions,
-                long_positions=long_positions,
-                short_positions=short_positions,
-                max_drawdown=max_drawdown,
-                leverage_ratio=leverage_ratio
+            ).one()
+            
+            # Daily P&L depends on the date, so the summary is recomputed when
+            # the day rolls over
+            return await portfolio_cache.get_or_set(
+                (user_id, datetime.utcnow().date(), position_count, last_update),
+                lambda: self._load_portfolio_summary(user_id)
             )
             
         except Exception as e:
             logger.error(f"Error getting portfolio summary: {e}")
             return None
     
-    async def get_order_book(self, request: OrderBookRequest) -> Optional[Dict[str, Any]]:
-        """Get order book for symbol"""
-        try:
-            # This would typically come from market data service
-            # For now, return mock data
-            return {
-                "symbol": request.symbol,
-                "exchange": request.exchange,
-                "timestamp": datetime.utcnow(),
-                "bid_levels": [
-                    {"price": 100.50, "quantity": 1000, "orders": 5},
-                    {"price": 100.49, "quantity": 500, "orders": 3},
-                    {"price": 100.48, "quantity": 750, "orders": 4}
-                ],
-                "ask_levels": [
-                    {"price": 100.51, "quantity": 800, "orders": 4},
-                    {"price": 100.52, "quantity": 1200, "orders": 6},
-                    {"price": 100.53, "quantity": 600, "orders": 3}
-                ],
-                "best_bid": 100.50,
-                "best_ask": 100.51,
-                "spread": 0.01,
-                "mid_price": 100.505,
-                "total_bid_quantity": 2250,
-                "total_ask_quantity": 2600
-            }
-            
-        except Exception as e:
-            logger.error(f"Error getting order book: {e}")
-            return None
-    
-    async def get_market_stats(self, symbol: str, exchange: str) -> Optional[MarketStats]:
-        """Get market statistics for symbol"""
-        try:
-            # This would typically come from market data service
-            # For now, return mock data
-            return MarketStats(
-                symbol=symbol,
-                exchange=exchange,
-                last_price=100.50,
-                bid_price=100.49,
-                ask_price=100.51,
-                last_quantity=100,
-                total_volume=50000,
-                total_buy_volume=25000,
-                total_sell_volume=25000,
-                trade_count=500,
-                price_change=0.50,
-                price_change_percent=0.50,
-                high_price=101.00,
-                low_price=99.50,
-                open_price=100.00,
-                vwap=100.45,
-                open_interest=10000,
-                timestamp=datetime.utcnow()
+    async def _load_portfolio_summary(self, user_id: int) -> PortfolioSummary:
+        """Load open positions and compute the portfolio summary from them"""
+        # Load only the columns the summary needs, one row per open position.
+        # The session is not thread-safe, so the query runs on the loop and
+        # the worker thread only sees plain tuples
+        rows = self.db.query(
+            *PORTFOLIO_NUMERIC_COLUMNS,
+            Position.position_type,
+            Position.last_updated_at
+        ).filter(
+            and_(
+                Position.user_id == user_id,
+                Position.status == 'OPEN'
             )
-            
-        except Exception as e:
-            logger.error(f"Error getting market stats: {e}")
-            return None
+        ).all()
+        
+        # The column math runs in a worker thread so a large portfolio doesn't
+        # block the event loop
+        return await asyncio.to_thread(self._compute_portfolio_summary, [tuple(row) for row in rows])
+    
+    @staticmethod
+    def _compute_portfolio_summary(rows: List[Tuple]) -> PortfolioSummary:
+        """Compute portfolio summary from open position rows (numeric columns, position type, last update)"""
+        # Numeric columns as one float array (missing values count as 0)
+        width = len(PORTFOLIO_NUMERIC_COLUMNS)
+        values = np.array([row[:width] for row in rows], dtype=np.float64).reshape(-1, width)
+        np.nan_to_num(values, copy=False)
+        (quantity, current_price, current_value, position_pnl, position_unrealized_pnl,
+         position_realized_pnl, position_investment, position_drawdown) = values.T
+        
+        # Calculate portfolio metrics with vectorized column operations
+        total_value = float(current_value.sum())
+        total_exposure = float(np.abs(quantity) @ current_price)
+        net_exposure = float(quantity @ current_price)
+        total_pnl = float(position_pnl.sum())
+        unrealized_pnl = float(position_unrealized_pnl.sum())
+        realized_pnl = float(position_realized_pnl.sum())
+        investment_value = float(position_investment.sum())
+        
+        # Calculate max drawdown (simplified)
+        max_drawdown = float(position_drawdown.max(initial=0))
+        
+        # Count position types with C-level list counts rather than generator passes
+        position_types = [row[width] for row in rows]
+        long_positions = position_types.count(PositionType.LONG)
+        short_positions = position_types.count(PositionType.SHORT)
+        
+        # Calculate daily P&L (simplified); update times are compared as naive
+        # UTC, and missing ones become NaT, which never equals today
+        today = np.datetime64(datetime.utcnow().date(), 'D')
+        last_updated = np.array([
+            updated_at.astimezone(timezone.utc).replace(tzinfo=None) if updated_at and updated_at.tzinfo else updated_at
+            for updated_at in (row[width + 1] for row in rows)
+        ], dtype='datetime64[us]')
+        updated_today = last_updated.astype('datetime64[D]') == today
+        # Only the total is needed, so sum under the mask instead of copying
+        # today's positions out into a new array first
+        daily_pnl = float(position_pnl.sum(where=updated_today))
+        
+        active_positions = len(rows)
+        
+        # Calculate leverage ratio
+        leverage_ratio = total_exposure / investment_value if investment_value > 0 else 1.0
+        
+        # Get user's cash balance (simplified - would come from account service)
+        available_cash = 100000.0  # Placeholder
+        used_margin = total_exposure * 0.5  # Placeholder
+        available_margin = available_cash - used_margin
+        margin_call_level = (used_margin / available_cash * 100) if available_cash > 0 else 0
+        
+        return PortfolioSummary(
+            total_value=total_value,
+            total_exposure=total_exposure,
+            net_exposure=net_exposure,
+            available_cash=available_cash,
+            used_margin=used_margin,
+            available_margin=available_margin,
+            margin_call_level=margin_call_level,
+            total_pnl=total_pnl,
+            daily_pnl=daily_pnl,
+            unrealized_pnl=unrealized_pnl,
+            realized_pnl=realized_pnl,
+            total_positions=active_positions,
+            active_positions=active_positions,
+            long_positions=long_positions,
+            short_positions=short_positions,
+            max_drawdown=max_drawdown,
+            leverage_ratio=leverage_ratio
+        )
     
     async def close_position(self, position_id: int, user_id: int, closing_price: float) -> Optional[Position]:
         """Close a position"""
@@ -548,21 +572,41 @@ class TradingService:
     async def process_market_data_update(self, symbol: str, price: float):
         """Process market data update and update positions"""
         try:
-            # Get all open positions for this symbol
-            positions = self.db.query(Position).filter(
+            # Reprice every open position for this symbol in one set-based
+            # UPDATE, with the same arithmetic as Position.update_current_price,
+            # instead of loading and updating each position row by row
+            unrealized_pnl = case(
+                (Position.position_type == PositionType.LONG,
+                 (price - Position.average_buy_price) * Position.quantity),
+                (Position.position_type == PositionType.SHORT,
+                 (Position.average_sell_price - price) * func.abs(Position.quantity)),
+                else_=Position.unrealized_pnl
+            )
+            total_pnl = Position.realized_pnl + unrealized_pnl
+            now = datetime.utcnow()
+            
+            updated = self.db.query(Position).filter(
                 and_(
                     Position.symbol == symbol,
                     Position.status == 'OPEN'
                 )
-            ).all()
-            
-            for position in positions:
-                # Update position with new price
-                position.update_current_price(price)
+            ).update({
+                Position.last_price: Position.current_price,
+                Position.current_price: price,
+                Position.current_value: func.abs(Position.quantity) * price,
+                Position.unrealized_pnl: unrealized_pnl,
+                Position.total_pnl: total_pnl,
+                Position.pnl_percentage: case(
+                    (Position.investment_value != 0, total_pnl / Position.investment_value * 100),
+                    else_=0.0
+                ),
+                Position.last_updated_at: now,
+                Position.updated_at: now
+            }, synchronize_session=False)
             
             self.db.commit()
             
-            logger.debug(f"Updated {len(positions)} positions for {symbol} with price {price}")
+            logger.debug("Updated %d positions for %s with price %s", updated, symbol, price)
             
         except Exception as e:
             logger.error(f"Error processing market data update: {e}")
@@ -571,80 +615,271 @@ class TradingService:
     async def get_trading_analytics(self, user_id: int, start_date: datetime, end_date: datetime) -> Optional[TradingAnalytics]:
         """Get trading analytics for period"""
         try:
-            # Get trades in period
-            trades = self.db.query(Trade).filter(
-                and_(
-                    Trade.user_id == user_id,
-                    Trade.executed_at >= start_date,
-                    Trade.executed_at <= end_date,
-                    Trade.status == TradeStatus.EXECUTED
-                )
-            ).all()
+            # The aggregation runs in the database, so there is no CPU work to
+            # offload; the session is not thread-safe, so it stays on the loop
+            return await analytics_cache.get_or_set(
+                (user_id, start_date, end_date),
+                lambda: self._compute_trading_analytics(user_id, start_date, end_date)
+            )
             
-            if not trades:
-                return None
+        except Exception as e:
+            logger.error(f"Error calculating trading analytics: {e}")
+            return None
+    
+    async def _compute_trading_analytics(self, user_id: int, start_date: datetime, end_date: datetime) -> Optional[TradingAnalytics]:
+        """Compute trading analytics for period from executed trades"""
+        # Aggregate the period's trades in the database in one pass over the
+        # rows, instead of loading every trade and reducing it in Python
+        pnl = func.coalesce(Trade.total_pnl, 0)
+        totals = self.db.query(
+            func.count(Trade.id).label("total_trades"),
+            func.count(case((pnl > 0, 1))).label("winning_trades"),
+            func.count(case((pnl < 0, 1))).label("loss_count"),
+            func.coalesce(func.sum(pnl), 0).label("total_pnl"),
+            func.coalesce(func.sum(case((pnl > 0, pnl), else_=0)), 0).label("gross_profit"),
+            func.coalesce(func.sum(case((pnl < 0, pnl), else_=0)), 0).label("loss_sum"),
+            func.max(pnl).label("max_pnl"),
+            func.min(pnl).label("min_pnl"),
+            func.coalesce(func.sum(Trade.brokerage + Trade.taxes + Trade.charges), 0).label("total_commission"),
+            func.coalesce(func.sum(func.coalesce(Trade.executed_value, 0)), 0).label("total_investment")
+        ).filter(
+            and_(
+                Trade.user_id == user_id,
+                Trade.executed_at >= start_date,
+                Trade.executed_at <= end_date,
+                Trade.status == TradeStatus.EXECUTED
+            )
+        ).one()
+        
+        if not totals.total_trades:
+            return None
+        
+        total_trades = totals.total_trades
+        winning_trades = totals.winning_trades
+        losing_trades = total_trades - winning_trades
+        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
+        
+        total_pnl = totals.total_pnl
+        gross_profit = totals.gross_profit
+        gross_loss = abs(totals.loss_sum)
+        profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
+        
+        average_win = gross_profit / winning_trades if winning_trades else 0
+        average_loss = totals.loss_sum / totals.loss_count if totals.loss_count else 0
+        
+        largest_win = max(totals.max_pnl, 0)
+        largest_loss = min(totals.min_pnl, 0)
+        
+        # Calculate average trade duration (simplified)
+        avg_duration = 24.0  # Placeholder in hours
+        
+        # Calculate Sharpe ratio (simplified)
+        sharpe_ratio = 1.5  # Placeholder
+        
+        # Calculate max drawdown (simplified)
+        max_drawdown = 5.0  # Placeholder in percentage
+        
+        # Total commission (Trade.calculate_charges) and invested value
+        total_commission = totals.total_commission
+        total_investment = totals.total_investment
+        
+        # Calculate return on investment
+        roi = (total_pnl / total_investment * 100) if total_investment > 0 else 0
+        
+        return TradingAnalytics(
+            period_start=start_date,
+            period_end=end_date,
+            total_trades=total_trades,
+            winning_trades=winning_trades,
+            losing_trades=losing_trades,
+            win_rate=win_rate,
+            total_pnl=total_pnl,
+            gross_profit=gross_profit,
+            gross_loss=gross_loss,
+            profit_factor=profit_factor,
+            average_win=average_win,
+            average_loss=average_loss,
+            largest_win=largest_win,
+            largest_loss=largest_loss,
+            average_trade_duration=avg_duration,
+            sharpe_ratio=sharpe_ratio,
+            sortino_ratio=None,  # Placeholder
+            max_drawdown=max_drawdown,
+            max_drawdown_duration=5,  # Placeholder in days
+            total_commission=total_commission,
+            net_pnl=total_pnl - total_commission,
+            return_on_investment=roi
+        )
+
+
+class MarketDataService:
+    """Service for shared market data (order books, market statistics)"""
+    
+    def __init__(self):
+        # One HTTP client for the market data source, so every request reuses its connection pool
+        self.client: Optional[httpx.AsyncClient] = None
+    
+    async def startup(self):
+        """Open the market data client"""
+        headers = {"X-API-Key": market_data_settings.API_KEY} if market_data_settings.API_KEY else None
+        self.client = httpx.AsyncClient(
+            base_url=market_data_settings.BASE_URL,
+            headers=headers,
+            timeout=market_data_settings.TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=market_data_settings.MAX_CONNECTIONS,
+                max_keepalive_connections=market_data_settings.MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        logger.info("Market data service started successfully")
+    
+    async def shutdown(self):
+        """Close the market data client"""
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+        logger.info("Market data service stopped")
+    
+    async def get_order_book(self, request: OrderBookRequest) -> Optional[Dict[str, Any]]:
+        """Get order book for symbol"""
+        try:
+            # Fetch the full book once per symbol and serve every depth from it
+            order_book = await market_data_cache.get_or_set(
+                ("order_book", request.symbol, request.exchange),
+                lambda: self._fetch_order_book(request.symbol, request.exchange)
+            )
             
-            # Calculate analytics
-            total_trades = len(trades)
-            winning_trades = len([t for t in trades if (t.total_pnl or 0) > 0])
-            losing_trades = total_trades - winning_trades
-            win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-            
-            total_pnl = sum(t.total_pnl or 0 for t in trades)
-            gross_profit = sum(t.total_pnl or 0 for t in trades if (t.total_pnl or 0) > 0)
-            gross_loss = abs(sum(t.total_pnl or 0 for t in trades if (t.total_pnl or 0) < 0))
-            profit_factor = gross_profit / gross_loss if gross_loss > 0 else float('inf')
-            
-            winning_trades_list = [t for t in trades if (t.total_pnl or 0) > 0]
-            losing_trades_list = [t for t in trades if (t.total_pnl or 0) < 0]
-            
-            average_win = sum(t.total_pnl or 0 for t in winning_trades_list) / len(winning_trades_list) if winning_trades_list else 0
-            average_loss = sum(t.total_pnl or 0 for t in losing_trades_list) / len(losing_trades_list) if losing_trades_list else 0
-            
-            largest_win = max([t.total_pnl or 0 for t in trades] + [0])
-            largest_loss = min([t.total_pnl or 0 for t in trades] + [0])
-            
-            # Calculate average trade duration (simplified)
-            avg_duration = 24.0  # Placeholder in hours
-            
-            # Calculate Sharpe ratio (simplified)
-            sharpe_ratio = 1.5  # Placeholder
-            
-            # Calculate max drawdown (simplified)
-            max_drawdown = 5.0  # Placeholder in percentage
-            
-            # Calculate total commission
-            total_commission = sum(t.calculate_charges() for t in trades)
-            
-            # Calculate return on investment
-            total_investment = sum(t.executed_value or 0 for t in trades)
-            roi = (total_pnl / total_investment * 100) if total_investment > 0 else 0
-            
-            return TradingAnalytics(
-                period_start=start_date,
-                period_end=end_date,
-                total_trades=total_trades,
-                winning_trades=winning_trades,
-                losing_trades=losing_trades,
-                win_rate=win_rate,
-                total_pnl=total_pnl,
-                gross_profit=gross_profit,
-                gross_loss=gross_loss,
-                profit_factor=profit_factor,
-                average_win=average_win,
-                average_loss=average_loss,
-                largest_win=largest_win,
-                largest_loss=largest_loss,
-                average_trade_duration=avg_duration,
-                sharpe_ratio=sharpe_ratio,
-                sortino_ratio=None,  # Placeholder
-                max_drawdown=max_drawdown,
-                max_drawdown_duration=5,  # Placeholder in days
-                total_commission=total_commission,
-                net_pnl=total_pnl - total_commission,
-                return_on_investment=roi
+            if (len(order_book["bid_levels"]) <= request.depth
+                    and len(order_book["ask_levels"]) <= request.depth):
+                return order_book
+            
+            # Only a side deeper than requested is copied and re-totalled; a side
+            # that already fits keeps the cached list and total
+            trimmed = dict(order_book)
+            for side in ("bid", "ask"):
+                levels = order_book[f"{side}_levels"]
+                if len(levels) > request.depth:
+                    levels = levels[:request.depth]
+                    trimmed[f"{side}_levels"] = levels
+                    trimmed[f"total_{side}_quantity"] = sum(map(LEVEL_QUANTITY, levels))
+            return trimmed
+            
+        except Exception as e:
+            logger.error(f"Error getting order book: {e}")
+            return None
+    
+    async def get_order_book_batch(self, symbols: List[str], exchange: str, depth: int) -> Dict[str, Dict[str, Any]]:
+        """Get order books for several symbols, fetching the uncached ones concurrently"""
+        # Bound the concurrent fetches so a large batch doesn't flood the market data source
+        fetch_slots = asyncio.Semaphore(market_data_settings.MAX_CONCURRENT_FETCHES)
+        
+        async def get_symbol_order_book(symbol: str) -> Optional[Dict[str, Any]]:
+            async with fetch_slots:
+                return await self.get_order_book(
+                    OrderBookRequest.construct(symbol=symbol, exchange=exchange, depth=depth)
+                )
+        
+        # Symbols already being fetched by other requests share that fetch
+        order_books = await asyncio.gather(*(get_symbol_order_book(symbol) for symbol in symbols))
+        
+        return {
+            symbol: order_book
+            for symbol, order_book in zip(symbols, order_books)
+            if order_book is not None
+        }
+    
+    async def get_market_stats(self, symbol: str, exchange: str) -> Optional[MarketStats]:
+        """Get market statistics for symbol"""
+        try:
+            # Concurrent requests for the same symbol share one fetch
+            return await market_data_cache.get_or_set(
+                ("market_stats", symbol, exchange),
+                lambda: self._fetch_market_stats(symbol, exchange)
             )
             
         except Exception as e:
-            logger.error(f"Error calculating trading analytics: {e}")
-            return None
\ No newline at end of file
+            logger.error(f"Error getting market stats: {e}")
+            return None
+    
+    async def get_market_stats_batch(self, symbols: List[str], exchange: str) -> Dict[str, MarketStats]:
+        """Get market statistics for several symbols with one fetch for the uncached ones"""
+        try:
+            stats = {}
+            missing = []
+            for symbol in symbols:
+                cached = market_data_cache.get(("market_stats", symbol, exchange))
+                if cached is None:
+                    missing.append(symbol)
+                else:
+                    stats[symbol] = cached
+            
+            if missing:
+                fetched = await self._fetch_market_stats_batch(missing, exchange)
+                for symbol, symbol_stats in fetched.items():
+                    market_data_cache.set(("market_stats", symbol, exchange), symbol_stats)
+                stats.update(fetched)
+            
+            # Keep the order the symbols were requested in
+            return {symbol: stats[symbol] for symbol in symbols if symbol in stats}
+            
+        except Exception as e:
+            logger.error(f"Error getting batch market stats: {e}")
+            return {}
+    
+    async def _fetch_order_book(self, symbol: str, exchange: str) -> Dict[str, Any]:
+        """Fetch order book from market data source at full depth"""
+        # This would typically come from self.client, asking for ORDER_BOOK_MAX_DEPTH levels
+        # For now, return mock data
+        return {
+            "symbol": symbol,
+            "exchange": exchange,
+            "timestamp": datetime.utcnow(),
+            "bid_levels": [
+                {"price": 100.50, "quantity": 1000, "orders": 5},
+                {"price": 100.49, "quantity": 500, "orders": 3},
+                {"price": 100.48, "quantity": 750, "orders": 4}
+            ],
+            "ask_levels": [
+                {"price": 100.51, "quantity": 800, "orders": 4},
+                {"price": 100.52, "quantity": 1200, "orders": 6},
+                {"price": 100.53, "quantity": 600, "orders": 3}
+            ],
+            "best_bid": 100.50,
+            "best_ask": 100.51,
+            "spread": 0.01,
+            "mid_price": 100.505,
+            "total_bid_quantity": 2250,
+            "total_ask_quantity": 2600
+        }
+    
+    async def _fetch_market_stats(self, symbol: str, exchange: str) -> MarketStats:
+        """Fetch market statistics from market data source"""
+        # This would typically come from self.client
+        # For now, return mock data
+        return MarketStats(
+            symbol=symbol,
+            exchange=exchange,
+            last_price=100.50,
+            bid_price=100.49,
+            ask_price=100.51,
+            last_quantity=100,
+            total_volume=50000,
+            total_buy_volume=25000,
+            total_sell_volume=25000,
+            trade_count=500,
+            price_change=0.50,
+            price_change_percent=0.50,
+            high_price=101.00,
+            low_price=99.50,
+            open_price=100.00,
+            vwap=100.45,
+            open_interest=10000,
+            timestamp=datetime.utcnow()
+        )
+    
+    async def _fetch_market_stats_batch(self, symbols: List[str], exchange: str) -> Dict[str, MarketStats]:
+        """Fetch market statistics for several symbols from market data source"""
+        # This would be a single multi-symbol quote request through self.client
+        # For now, return mock data
+        return {symbol: await self._fetch_market_stats(symbol, exchange) for symbol in symbols}
+
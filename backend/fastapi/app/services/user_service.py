@@ -11,6 +11,9 @@ import logging
 
 from app.core.database import get_db
 from app.models.user import User
+from app.models.risk import RiskSettings
+from app.models.trade import Trade
+from app.models.strategy import Strategy
 from app.core.security import get_password_hash, verify_password
 from app.core.logging import log_security_event, log_error
 
@@ -370,8 +373,6 @@ class UserService:
     ) -> bool:
         """Update user risk settings"""
         try:
-            from app.models.risk import RiskSettings
-            
             # Get or create risk settings
             risk_settings = self.db.query(RiskSettings).filter(
                 RiskSettings.user_id == user_id
@@ -450,9 +451,6 @@ class UserService:
     async def get_user_stats(self, user_id: int) -> Optional[dict]:
         """Get user statistics"""
         try:
-            from app.models.trade import Trade
-            from app.models.strategy import Strategy
-            
             user = await self.get_user_by_id(user_id)
             if not user:
                 return None
@@ -0,0 +1,56 @@
+"""
+Strategy backtest endpoint tests
+"""
+
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.strategies import router, get_strategy_service
+from app.core.security import get_current_user_from_token
+from app.services.strategy_service import StrategyService
+
+
+def _client(service: StrategyService) -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_current_user_from_token] = lambda: SimpleNamespace(id=1)
+    app.dependency_overrides[get_strategy_service] = lambda: service
+    return TestClient(app)
+
+
+def test_backtest_rejects_period_shorter_than_config_lookback(monkeypatch):
+    # Created through the API, so the lookback is in config, not parameters
+    strategy = SimpleNamespace(
+        id=1,
+        config={"fast_period": 50, "slow_period": 200},
+        parameters=None,
+        symbols=["RELIANCE"],
+        timeframes=["1d"]
+    )
+    history_loads = []
+    
+    async def get_strategy(strategy_id, user_id):
+        return strategy
+    
+    async def get_history(*args):
+        history_loads.append(args)
+        raise AssertionError("history loaded for a too-short backtest period")
+    
+    service = StrategyService(db=None)
+    monkeypatch.setattr(service, "get_strategy", get_strategy)
+    monkeypatch.setattr(service, "_get_history", get_history)
+    
+    response = _client(service).post(
+        "/strategies/1/backtest",
+        json={
+            "start_date": "2024-01-01T00:00:00",
+            "end_date": "2024-01-02T00:00:00",
+            "initial_capital": 100000
+        }
+    )
+    
+    assert response.status_code == 422
+    assert "200 bars" in response.json()["detail"]
+    assert history_loads == []
@@ -0,0 +1,45 @@
+"""
+User schema validation tests
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.user import UserCreate, UserUpdate
+
+
+def _user_create(**overrides):
+    data = {
+        "username": "trader",
+        "email": "trader@example.com",
+        "password": "s3cure-pass",
+    }
+    data.update(overrides)
+    return UserCreate(**data)
+
+
+@pytest.mark.parametrize("phone_number", [None, "", "9876543210"])
+def test_user_create_accepts_valid_phone_numbers(phone_number):
+    user = _user_create(phone_number=phone_number)
+    
+    assert user.phone_number == phone_number
+
+
+@pytest.mark.parametrize("phone_number", ["98765", "98765432101", "98765-4321"])
+def test_user_create_rejects_invalid_phone_numbers(phone_number):
+    with pytest.raises(ValidationError):
+        _user_create(phone_number=phone_number)
+
+
+@pytest.mark.parametrize("password", ["short", "x" * 129])
+def test_user_create_enforces_password_length(password):
+    with pytest.raises(ValidationError):
+        _user_create(password=password)
+
+
+def test_user_update_validates_phone_number():
+    assert UserUpdate(phone_number="9876543210").phone_number == "9876543210"
+    assert UserUpdate().phone_number is None
+    
+    with pytest.raises(ValidationError):
+        UserUpdate(phone_number="12345abcde")